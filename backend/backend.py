@@ -10,26 +10,63 @@
 """
 
 # 导入必要的模块
-from flask import Flask, jsonify, request  # Flask框架，用于创建Web服务
+from flask import Flask, request, g, has_request_context  # Flask框架，用于创建Web服务
 from flask_cors import CORS  # CORS跨域支持
+from flask_caching import Cache  # 接口响应缓存
 import requests  # 用于发送HTTP请求，爬取网页内容
-from bs4 import BeautifulSoup  # 用于解析HTML内容
+import requests_cache  # 用于缓存已爬取的页面，避免重复下载
+from requests.adapters import HTTPAdapter  # 用于配置HTTP连接池
+from urllib3.util.retry import Retry  # 用于连接层的自动重试
+from bs4 import BeautifulSoup, SoupStrainer  # 用于解析HTML内容
 from datetime import datetime, timedelta  # 用于日期处理
+from concurrent.futures import ThreadPoolExecutor, as_completed  # 用于并发请求页面
 import sqlite3  # 用于SQLite数据库操作
+import threading  # 用于取消不再需要的页面请求
+import queue  # 用于数据库连接池
 import os  # 用于文件路径处理
+import functools  # 用于缓存已加载的配置
+import hashlib  # 用于计算响应的ETag
+import time  # 用于请求间的延迟
+import random  # 用于随机延迟和随机选择User-Agent
+import re  # 用于正则表达式匹配，清理标题和正文
 import yaml  # 用于解析YAML配置文件
+import orjson  # 用于快速序列化JSON响应和解析API返回的JSON数据
+import zstandard as zstd  # 用于解压数据库中压缩存储的新闻内容
+from db_schema import ensure_schema  # 新闻表结构，与爬虫程序共用
+
+# HTML解析器，优先使用C实现的lxml，未安装时回退到Python内置的html.parser
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+    HTML_PARSER = 'lxml'
+except ImportError:
+    lxml_html = None
+    etree = None
+    HTML_PARSER = 'html.parser'
+
+# YAML加载器，优先使用libyaml的C实现，未安装时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# 解析时只保留需要的标签，跳过脚本、样式、导航等无关节点的建树开销
+_LIST_STRAINER = SoupStrainer(['ul', 'div', 'a', 'meta', 'title'])  # 新闻列表页
+_ITEM_STRAINER = SoupStrainer(['article', 'p', 'div', 'meta'])  # 新闻详情页
 
 # 加载配置文件
+@functools.lru_cache(maxsize=1)
 def load_config():
     """
     加载配置文件
+    解析结果会被缓存，同一进程内重复调用不会再次读取和解析文件
     
     :return: 配置字典
     """
     config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
     except Exception as e:
         print(f"加载配置文件失败: {e}")
         # 返回默认配置
@@ -46,6 +83,34 @@ config = load_config()
 app = Flask(__name__)
 # 启用CORS，允许所有跨域请求
 CORS(app, resources=r'/*')
+# 启用响应缓存，相同日期/链接的爬取结果直接返回缓存，避免重复爬取
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 3600})
+
+
+# JSON响应函数
+def ojson(obj, status=200):
+    """
+    使用orjson序列化并返回JSON响应
+    orjson比标准库json更快，且中文直接以UTF-8输出，不转义为\\uXXXX
+    
+    :param obj: 要返回的数据
+    :param status: HTTP状态码，默认为200
+    :return: Flask响应对象
+    """
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
+# 响应缓存过滤函数
+def _is_success_response(response):
+    """
+    判断接口响应是否可以缓存
+    爬取失败时接口仍返回HTTP 200，只在响应体中的code标明错误，失败结果不缓存，下次请求重新爬取
+    
+    :param response: Flask响应对象
+    :return: bool 响应体的code为200时返回True
+    """
+    return orjson.loads(response.get_data()).get('code') == 200
+
 
 # 请求头，模拟浏览器访问，避免被反爬
 HEADERS = {
@@ -56,67 +121,268 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1"
 }
 
+# User-Agent池，每次请求随机选择一个，模拟不同浏览器
+_UA_POOL = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.63 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/89.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/90.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/91.0.864.59",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/92.0.902.55"
+)
+
 # 数据库文件路径，使用绝对路径
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), config['database']['path'])
 
+# 页面缓存会话，缓存存放在数据库旁的SQLite文件中
+# 缓存过期后会自动携带If-None-Match/If-Modified-Since发起条件请求，页面未变化时无需重新下载
+_SESSION = requests_cache.CachedSession(
+    DB_PATH + '.http-cache',
+    backend='sqlite',
+    expire_after=86400,  # 默认缓存1天
+    allowable_methods=('GET',)
+)
+_SESSION.headers.update(HEADERS)
+# 连接池复用TCP/TLS连接，并发请求时每个主机最多保持16个连接；服务端5xx错误由连接层先行重试
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+)
+_SESSION.mount('https://', _HTTP_ADAPTER)
+_SESSION.mount('http://', _HTTP_ADAPTER)
+
+# 页面缓存的保留策略，避免缓存文件随爬取的日期数无限增长
+# 新闻详情页的正文已存入数据库，不缓存；历史日期的列表页缓存30天，过期条目每天清理一次
+_HISTORY_PAGE_EXPIRE = 30 * 86400  # 历史日期列表页的缓存有效期（秒）
+_HTTP_CACHE_PURGE_INTERVAL = 86400  # 清理过期缓存的间隔（秒）
+_http_cache_purge_lock = threading.Lock()
+_http_cache_purged_at = None  # 上次清理的time.monotonic()时间，None表示本进程尚未清理
+
+
+# 页面缓存清理函数
+def purge_http_cache():
+    """
+    删除页面缓存中已过期的条目，距上次清理不足_HTTP_CACHE_PURGE_INTERVAL秒时直接返回
+    """
+    global _http_cache_purged_at
+    with _http_cache_purge_lock:
+        now = time.monotonic()
+        if _http_cache_purged_at is not None and now - _http_cache_purged_at < _HTTP_CACHE_PURGE_INTERVAL:
+            return
+        _http_cache_purged_at = now
+    try:
+        _SESSION.cache.delete(expired=True)
+    except Exception as e:
+        print(f"清理页面缓存失败: {e}")
+
+
+# 数据库连接池，空闲连接放回池中供后续请求复用，避免每次请求都重新打开数据库文件并执行PRAGMA
+# 开发服务器为每个请求新建线程，因此连接不能按线程缓存
+_DB_POOL_SIZE = 8  # 最多保留的空闲连接数，超出的连接用完即关闭
+_db_pool = queue.LifoQueue(maxsize=_DB_POOL_SIZE)
+
 
 # 数据库连接函数
 def get_db_connection():
     """
     获取数据库连接
+    优先从连接池取出空闲连接，池为空时新建连接并设置WAL等PRAGMA
+    在请求中调用时，同一请求内返回同一连接，请求结束后自动放回连接池，调用方不要关闭
     
     :return: sqlite3.Connection 对象，数据库连接
     """
+    if has_request_context() and 'db_conn' in g:  # 本次请求已取得连接
+        return g.db_conn
+    
     try:
-        # 连接SQLite数据库
-        conn = sqlite3.connect(DB_PATH)
-        # 设置row_factory为sqlite3.Row，使查询结果可以像字典一样访问
-        conn.row_factory = sqlite3.Row
-        return conn
+        conn = _db_pool.get_nowait()  # 复用空闲连接
+    except queue.Empty:
+        try:
+            # 连接SQLite数据库，isolation_level=None为自动提交模式，只读查询无需事务
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+            # WAL模式允许读写并发，并减少每次提交的fsync
+            conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA mmap_size=268435456;
+                PRAGMA cache_size=-20000;
+                PRAGMA busy_timeout=5000;
+            """)
+            # 设置row_factory为sqlite3.Row，使查询结果可以像字典一样访问
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error as e:
+            # 连接失败，打印错误信息
+            print(f"数据库连接失败: {e}")
+            return None
+    
+    if has_request_context():  # 请求结束时由release_db_connection放回连接池
+        g.db_conn = conn
+    return conn
+
+
+# 数据库连接归还函数
+def put_db_connection(conn):
+    """
+    把数据库连接放回连接池，连接池已满时关闭该连接
+    
+    :param conn: get_db_connection返回的连接
+    """
+    try:
+        _db_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+# 请求结束时归还数据库连接
+@app.teardown_appcontext
+def release_db_connection(exc):
+    """
+    请求结束时把本次请求取得的数据库连接放回连接池
+    
+    :param exc: 请求处理中未捕获的异常，没有时为None
+    """
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        put_db_connection(conn)
+
+
+# 数据库表结构初始化函数
+def init_db():
+    """
+    启动时确保数据库表结构为最新
+    旧版本的数据库缺少item_index、content_zstd等列，迁移后查询接口才能执行
+    """
+    conn = get_db_connection()  # 获取数据库连接
+    if not conn:  # 连接失败，错误已打印
+        return
+    
+    try:
+        if ensure_schema(conn):
+            print("数据库表结构已更新到最新版本")
     except sqlite3.Error as e:
-        # 连接失败，打印错误信息
-        print(f"数据库连接失败: {e}")
-        return None
+        # 初始化失败，打印错误信息
+        print(f"数据库表结构初始化失败: {e}")
+    finally:
+        put_db_connection(conn)  # 不在请求中，需要手动放回连接池
+
+
+# 启动时初始化一次，Gunicorn等WSGI服务器导入本模块时同样执行
+init_db()
+
+# 新闻表已有的列名，表结构为最新时只读取一次
+_NEWS_COLUMNS = set()
+
+
+# 新闻表列名获取函数
+def news_table_columns(conn):
+    """
+    获取新闻表的列名
+    启动时的迁移未能完成（如数据库只读或被长时间锁定）时，每次都重新读取，爬虫程序完成迁移后立即生效
+    
+    :param conn: 数据库连接
+    :return: 列名集合
+    """
+    if 'content_zstd' not in _NEWS_COLUMNS:
+        _NEWS_COLUMNS.update(row['name'] for row in conn.execute("PRAGMA table_info(news_联播);"))
+    return _NEWS_COLUMNS
+
+
+# 标题清理用的正则表达式，模块加载时预编译，避免在循环中重复编译
+# 一次匹配即可移除"完整版[视频]"、"完整版"、"[视频]"以及"00:02:18"、"20260110"、"2026-01-10"等时间字符
+_RE_TITLE_STRIP = re.compile(r'完整版\[视频\]|完整版|\[视频\]|\d{2}:\d{2}:\d{2}|\d{8}|\d{4}-\d{2}-\d{2}')
+
+# 新闻链接关键词，编译为一个正则，一次扫描即可判断是否包含任一关键词
+_RE_NEWS_KEYWORDS = re.compile('新闻联播|视频|联播快讯|央视网')
+
+# 新闻正文中要过滤的内容，较长的文本排在前面，保证优先整体匹配
+_ITEM_FILTERS = [
+    "央视网消息\n（新闻联播）：\n",
+    "央视网消息\n（新闻联播）：",
+    "央视网消息（新闻联播）：",
+    "责任编辑：",
+    "主要内容",
+    "编辑：",
+    "责任",
+    "陈平丽",
+    "刘亮"
+]
+_RE_ITEM_FILTER = re.compile('|'.join(re.escape(text) for text in _ITEM_FILTERS))
+
+# 正文末尾作者信息的匹配模式
+_RE_CN_NAME = re.compile(r'[\u4e00-\u9fa5]{2,4}')  # 简单中文姓名（2-4个汉字），配合fullmatch使用
+_RE_AUTHOR = re.compile(r'^(编辑：|责任编辑：|文\s*/|图\s*/|摄影\s*：|记者\s*：|\s*作者\s*：)')  # 作者标识行
+_RE_TAIL_NAME = re.compile(r'(?<=[。.])\s*[\u4e00-\u9fa5]{2,4}$')  # 句号后紧跟的编辑姓名
+
+
+# 标题清理函数
+def _clean_title(title):
+    """
+    清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
+    
+    :param title: 原始标题
+    :return: 清理后的标题
+    """
+    return _RE_TITLE_STRIP.sub('', title).strip()  # 单次替换后清理空格
+
+
+# 页面链接遍历函数
+def iter_anchors(page, soup=None):
+    """
+    遍历页面中所有的a标签
+    安装了lxml时直接在lxml树上遍历，不为每个a标签创建BeautifulSoup对象
+    
+    :param page: 页面HTML内容
+    :param soup: 已解析的BeautifulSoup对象，未安装lxml时直接复用，避免重复解析页面
+    :return: 生成器，逐个返回(链接, 标题)
+    """
+    if lxml_html is None:  # 未安装lxml，回退到BeautifulSoup
+        if soup is None:
+            soup = BeautifulSoup(page, HTML_PARSER, parse_only=SoupStrainer('a'))
+        for a_tag in soup.find_all('a'):
+            yield a_tag.get('href', ''), a_tag.get_text(strip=True)
+        return
+    
+    tree = lxml_html.fromstring(page)
+    for a_tag in tree.iter('a'):
+        yield a_tag.get('href', ''), a_tag.text_content().strip()
 
 
 # 页面获取函数
-def fetch_page(url):
+def fetch_page(url, expire_after=None, cancel=None):
     """
     获取页面内容，增加重试机制和反爬优化
+    已缓存的页面直接从本地缓存读取
     
     :param url: 要爬取的网页URL
-    :return: 页面HTML内容，失败返回None
+    :param expire_after: 缓存有效期（秒），None表示使用默认有效期，requests_cache.DO_NOT_CACHE表示不缓存
+    :param cancel: threading.Event，被设置后不再发起新的重试并结束等待，None表示不可取消
+    :return: 页面HTML内容，失败或被取消返回None
     """
     max_retries = 5  # 最大重试次数
-    
-    # 增加请求头池，模拟不同浏览器
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/93.0.4577.63 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/89.0",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/90.0",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/91.0.864.59",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/92.0.902.55"
-    ]
-    
-    import time
-    import random
+    purge_http_cache()  # 定期清理过期的缓存条目
+    if cancel is None:  # 未设置的Event上wait()等同于sleep()
+        cancel = threading.Event()
     
     # 重试机制
     for retry in range(max_retries):
         try:
-            print(f"请求页面 (重试 {retry+1}/{max_retries}): {url}")
+            # 增加随机延迟，避免请求过于频繁，已缓存的页面无需等待
+            if not _SESSION.cache.contains(url=url):
+                cancel.wait(random.uniform(0.5, 2.0))
+            if cancel.is_set():  # 已不再需要该页面
+                print(f"已取消请求页面: {url}")
+                return None
             
-            # 随机选择一个User-Agent
-            random_headers = HEADERS.copy()
-            random_headers['User-Agent'] = random.choice(user_agents)
+            print(f"请求页面 (重试 {retry+1}/{max_retries}): {url}")
             
-            # 增加随机延迟，避免请求过于频繁
-            time.sleep(random.uniform(0.5, 2.0))
+            # 随机选择一个User-Agent，其余请求头使用_SESSION中的默认值
+            random_headers = {'User-Agent': random.choice(_UA_POOL)}
             
             # 发送GET请求
-            response = requests.get(url, headers=random_headers, timeout=20, stream=True)
+            response = _SESSION.get(url, headers=random_headers, timeout=20, stream=True, expire_after=expire_after)
             response.encoding = 'utf-8'
             
             if response.status_code == 200:
@@ -135,22 +401,23 @@ def fetch_page(url):
             # 针对连接重置错误，增加更长的延迟
             if '10054' in str(e) or '远程主机强迫关闭了一个现有的连接' in str(e):
                 print(f"检测到连接重置错误，增加延迟后重试...")
-                time.sleep(random.uniform(2.0, 5.0))
+                cancel.wait(random.uniform(2.0, 5.0))
         except Exception as e:
             print(f"获取页面异常: {e}")
         
         # 重试间隔，随重试次数增加而增加
         retry_delay = random.uniform(1.0, 3.0) * (retry + 1)
         print(f"重试间隔: {retry_delay:.2f}秒")
-        time.sleep(retry_delay)
+        cancel.wait(retry_delay)
     
     print(f"多次重试后仍无法获取页面")
     return None
 
 
 # 获取最近7天的新闻列表
-# @app.route('/news/list', methods=['GET'])
-# def news_list():
+@app.route('/news/list', methods=['GET'])
+@cache.cached(timeout=300, response_filter=_is_success_response)
+def news_list():
     """
     获取最近7天的新闻列表
     
@@ -176,7 +443,7 @@ def fetch_page(url):
             })
         
         # 返回成功响应
-        return jsonify({
+        return ojson({
             "code": 200,
             "message": "success",
             "data": news_list
@@ -185,7 +452,7 @@ def fetch_page(url):
     except Exception as e:
         # 发生异常，返回错误响应
         print(f"获取新闻列表失败: {e}")
-        return jsonify({
+        return ojson({
             "code": 500,
             "message": f"获取新闻列表失败: {str(e)}",
             "data": []
@@ -193,8 +460,9 @@ def fetch_page(url):
 
 
 # 获取指定日期的新闻内容
-# @app.route('/news/content', methods=['GET'])
-# def news_content():
+@app.route('/news/content', methods=['GET'])
+@cache.cached(timeout=3600, query_string=True, response_filter=_is_success_response)
+def news_content():
     """
     获取指定日期的新闻内容
     流程：确认日期 -> 爬取该日期的新闻标题 -> 获取每条新闻的详情链接
@@ -204,7 +472,7 @@ def fetch_page(url):
     # 获取日期参数
     date = request.args.get('date')
     if not date:  # 检查日期参数是否存在
-        return jsonify({
+        return ojson({
             "code": 400,
             "message": "缺少date参数"
         })
@@ -223,32 +491,30 @@ def fetch_page(url):
             f"https://tv.cctv.com/lm/xwlb/index.shtml?date={target_date}"
         ]
         
-        date_page = None
-        # 尝试不同的URL格式，直到获取成功
-        for url_format in url_formats:
-            print(f"尝试URL格式: {url_format}")
-            date_page = fetch_page(url_format)
-            if date_page:
-                break
+        # 历史日期的页面不会再变化，可以长期缓存；当天及以后的页面10分钟后重新验证
+        if date < datetime.now().strftime('%Y-%m-%d'):
+            expire_after = _HISTORY_PAGE_EXPIRE
+        else:
+            expire_after = 600
+        
+        # 并发尝试不同的URL格式，按上面的顺序使用第一个获取成功的页面
+        date_url, date_page = fetch_first_page(url_formats, expire_after)
+        if date_page:
+            print(f"使用URL格式: {date_url}")
         
         if not date_page:  # 所有URL格式都尝试失败
             raise Exception("无法获取新闻页面")
         
         # 解析页面，提取新闻标题和链接
-        soup = BeautifulSoup(date_page, 'html.parser')
+        soup = BeautifulSoup(date_page, HTML_PARSER, parse_only=_LIST_STRAINER)
         
         # 查找新闻条目，尝试多种可能的方式
         news_items = []
         
         # 方式1: 尝试当前页面的选择器
         print("尝试方式1: 查找ul标签中的新闻列表")
-        ul_selectors = [
-            soup.find('ul', class_='rililist'),
-            soup.find('ul', id='content'),
-            soup.find('ul', class_='news-items')
-        ]
-        
-        for ul in ul_selectors:
+        # 使用一个组合CSS选择器，只遍历一次文档树
+        for ul in soup.select('ul.rililist, ul#content, ul.news-items'):
             if ul:  # 如果找到ul标签
                 list_items = ul.find_all('li')  # 查找所有li标签
                 for i, li in enumerate(list_items):
@@ -260,17 +526,7 @@ def fetch_page(url):
                             # 只过滤掉完整的"完整版《新闻联播》"条目（完整广播），保留其他新闻条目
                             if not (title.startswith('完整版《新闻联播》') or title.startswith('完整版<新闻联播>')):
                                 # 清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
-                                clean_title = title
-                                clean_title = clean_title.replace('完整版[视频]', '', 1)  # 移除"完整版[视频]"
-                                clean_title = clean_title.replace('完整版', '', 1)  # 移除"完整版"
-                                clean_title = clean_title.replace('[视频]', '', 1)  # 移除"[视频]"
-                                
-                                # 移除时间字符，如"00:02:18"或"20260110"等时间格式
-                                import re
-                                clean_title = re.sub(r'\d{2}:\d{2}:\d{2}', '', clean_title)  # 移除"00:02:18"格式
-                                clean_title = re.sub(r'\d{8}', '', clean_title)  # 移除"20260110"格式
-                                clean_title = re.sub(r'\d{4}-\d{2}-\d{2}', '', clean_title)  # 移除"2026-01-10"格式
-                                clean_title = clean_title.strip()  # 清理空格
+                                clean_title = _clean_title(title)
                                 
                                 # 补全相对链接
                                 if not href.startswith('http'):
@@ -285,16 +541,9 @@ def fetch_page(url):
         # 方式2: 如果方式1失败，尝试查找所有包含新闻链接的div
         if not news_items:
             print("尝试方式2: 查找div标签中的新闻列表")
-            div_selectors = [
-                soup.find('div', class_='news-list'),
-                soup.find('div', id='news-list'),
-                soup.find('div', class_='list-content'),
-                soup.find('div', class_='content-list'),
-                soup.find('div', class_='video-list'),
-                soup.find('div', id='video-list')
-            ]
-            
-            for div in div_selectors:
+            # 使用一个组合CSS选择器，只遍历一次文档树
+            div_selector = 'div.news-list, div#news-list, div.list-content, div.content-list, div.video-list, div#video-list'
+            for div in soup.select(div_selector):
                 if div:  # 如果找到div标签
                     a_tags = div.find_all('a')  # 查找所有a标签
                     for i, a_tag in enumerate(a_tags):
@@ -304,20 +553,7 @@ def fetch_page(url):
                             # 只过滤掉完整的"完整版《新闻联播》"条目（完整广播），保留其他新闻条目
                             if not (title.startswith('完整版《新闻联播》') or title.startswith('完整版<新闻联播>')):
                                 # 清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
-                                clean_title = title
-                                if clean_title.startswith('完整版[视频]'):
-                                    clean_title = clean_title[6:]  # 移除"完整版[视频]"
-                                elif clean_title.startswith('完整版'):
-                                    clean_title = clean_title[3:]  # 移除"完整版"
-                                # 移除"[视频]"标签
-                                clean_title = clean_title.replace('[视频]', '', 1)
-                                
-                                # 移除时间字符，如"00:02:18"或"20260110"等时间格式
-                                import re
-                                clean_title = re.sub(r'\d{2}:\d{2}:\d{2}', '', clean_title)  # 移除"00:02:18"格式
-                                clean_title = re.sub(r'\d{8}', '', clean_title)  # 移除"20260110"格式
-                                clean_title = re.sub(r'\d{4}-\d{2}-\d{2}', '', clean_title)  # 移除"2026-01-10"格式
-                                clean_title = clean_title.strip()  # 清理空格
+                                clean_title = _clean_title(title)
                                 
                                 # 补全相对链接
                                 if not href.startswith('http'):
@@ -329,75 +565,45 @@ def fetch_page(url):
                                     "link": href
                                 })
         
-        # 方式3: 如果方式1和方式2失败，尝试查找页面中所有的a标签，过滤出新闻链接
+        # 方式3和方式4: 如果方式1和方式2失败，只遍历一次页面中所有的a标签，同时收集两种方式的结果
+        # 方式3: 链接包含news、video或VID的新闻链接
+        # 方式4: 方式3没有结果时，使用标题或链接中包含特定关键词的链接
         if not news_items:
-            print("尝试方式3: 查找页面中所有的新闻链接")
-            all_a_tags = soup.find_all('a')  # 查找所有a标签
-            for i, a_tag in enumerate(all_a_tags):
-                href = a_tag.get('href', '')  # 获取链接
-                title = a_tag.get_text(strip=True)  # 获取标题
-                # 过滤条件：链接包含news或video，且标题不为空
-                if href and title and ('news' in href or 'video' in href or 'VID' in href):
-                            # 只过滤掉完整的"完整版《新闻联播》"条目（完整广播），保留其他新闻条目
-                            if not (title.startswith('完整版《新闻联播》') or title.startswith('完整版<新闻联播>')):
-                                # 清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
-                                clean_title = title
-                                clean_title = clean_title.replace('完整版[视频]', '', 1)  # 移除"完整版[视频]"
-                                clean_title = clean_title.replace('完整版', '', 1)  # 移除"完整版"
-                                clean_title = clean_title.replace('[视频]', '', 1)  # 移除"[视频]"
-                                
-                                # 移除时间字符，如"00:02:18"或"20260110"等时间格式
-                                import re
-                                clean_title = re.sub(r'\d{2}:\d{2}:\d{2}', '', clean_title)  # 移除"00:02:18"格式
-                                clean_title = re.sub(r'\d{8}', '', clean_title)  # 移除"20260110"格式
-                                clean_title = re.sub(r'\d{4}-\d{2}-\d{2}', '', clean_title)  # 移除"2026-01-10"格式
-                                clean_title = clean_title.strip()  # 清理空格
-                                
-                                # 补全相对链接
-                                if not href.startswith('http'):
-                                    href = f"https://tv.cctv.com{href}"
-                                # 添加到新闻条目列表
-                                news_items.append({
-                                    "number": str(i + 1),
-                                    "title": clean_title,
-                                    "link": href
-                                })
-        
-        # 方式4: 如果方式1、方式2和方式3失败，尝试查找页面中包含特定关键词的链接
-        if not news_items:
-            print("尝试方式4: 查找包含特定关键词的链接")
-            all_a_tags = soup.find_all('a')  # 查找所有a标签
-            keywords = ['新闻联播', '视频', '联播快讯', '央视网']  # 关键词列表
-            for i, a_tag in enumerate(all_a_tags):
-                href = a_tag.get('href', '')  # 获取链接
-                title = a_tag.get_text(strip=True)  # 获取标题
-                if href and title:  # 链接和标题都存在
-                            # 检查标题或链接中是否包含关键词
-                            if any(keyword in title or keyword in href for keyword in keywords):
-                                # 只过滤掉完整的"完整版《新闻联播》"条目（完整广播），保留其他新闻条目
-                                if not (title.startswith('完整版《新闻联播》') or title.startswith('完整版<新闻联播>')):
-                                    # 清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
-                                    clean_title = title
-                                    clean_title = clean_title.replace('完整版[视频]', '', 1)  # 移除"完整版[视频]"
-                                    clean_title = clean_title.replace('完整版', '', 1)  # 移除"完整版"
-                                    clean_title = clean_title.replace('[视频]', '', 1)  # 移除"[视频]"
-                                    
-                                    # 移除时间字符，如"00:02:18"或"20260110"等时间格式
-                                    import re
-                                    clean_title = re.sub(r'\d{2}:\d{2}:\d{2}', '', clean_title)  # 移除"00:02:18"格式
-                                    clean_title = re.sub(r'\d{8}', '', clean_title)  # 移除"20260110"格式
-                                    clean_title = re.sub(r'\d{4}-\d{2}-\d{2}', '', clean_title)  # 移除"2026-01-10"格式
-                                    clean_title = clean_title.strip()  # 清理空格
-                                    
-                                    # 补全相对链接
-                                    if not href.startswith('http'):
-                                        href = f"https://tv.cctv.com{href}"
-                                    # 添加到新闻条目列表
-                                    news_items.append({
-                                        "number": str(i + 1),
-                                        "title": clean_title,
-                                        "link": href
-                                    })
+            print("尝试方式3/方式4: 查找页面中所有的新闻链接")
+            link_items = []  # 方式3的结果
+            keyword_items = []  # 方式4的结果
+            for i, (href, title) in enumerate(iter_anchors(date_page, soup)):
+                if not (href and title):  # 链接和标题都存在
+                    continue
+                # 只过滤掉完整的"完整版《新闻联播》"条目（完整广播），保留其他新闻条目
+                if title.startswith('完整版《新闻联播》') or title.startswith('完整版<新闻联播>'):
+                    continue
+                
+                is_news_link = 'news' in href or 'video' in href or 'VID' in href
+                # 检查标题或链接中是否包含关键词
+                has_keyword = bool(_RE_NEWS_KEYWORDS.search(title) or _RE_NEWS_KEYWORDS.search(href))
+                if not (is_news_link or has_keyword):
+                    continue
+                
+                # 补全相对链接
+                if not href.startswith('http'):
+                    href = f"https://tv.cctv.com{href}"
+                # 清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
+                item = {
+                    "number": str(i + 1),
+                    "title": _clean_title(title),
+                    "link": href
+                }
+                if is_news_link:
+                    link_items.append(item)
+                if has_keyword:
+                    keyword_items.append(item)
+            
+            if link_items:
+                news_items = link_items
+            else:
+                print("方式3未找到新闻链接，使用方式4: 包含特定关键词的链接")
+                news_items = keyword_items
         
         # 方式5: 如果还是没有找到，尝试从页面标题中提取信息
         if not news_items:
@@ -406,17 +612,7 @@ def fetch_page(url):
             # 只过滤掉完整的"完整版《新闻联播》"条目（完整广播）
             if not (page_title.startswith('完整版《新闻联播》') or page_title.startswith('完整版<新闻联播>')):
                 # 清理标题，移除"完整版[视频]"前缀、"[视频]"标签和时间字符
-                clean_title = page_title
-                clean_title = clean_title.replace('完整版[视频]', '', 1)  # 移除"完整版[视频]"
-                clean_title = clean_title.replace('完整版', '', 1)  # 移除"完整版"
-                clean_title = clean_title.replace('[视频]', '', 1)  # 移除"[视频]"
-                
-                # 移除时间字符，如"00:02:18"或"20260110"等时间格式
-                import re
-                clean_title = re.sub(r'\d{2}:\d{2}:\d{2}', '', clean_title)  # 移除"00:02:18"格式
-                clean_title = re.sub(r'\d{8}', '', clean_title)  # 移除"20260110"格式
-                clean_title = re.sub(r'\d{4}-\d{2}-\d{2}', '', clean_title)  # 移除"2026-01-10"格式
-                clean_title = clean_title.strip()  # 清理空格
+                clean_title = _clean_title(page_title)
                 
                 # 添加到新闻条目列表
                 news_items.append({
@@ -439,7 +635,7 @@ def fetch_page(url):
             item["number"] = str(i + 1)
         
         # 返回成功响应
-        return jsonify({
+        return ojson({
             "code": 200,
             "message": "success",
             "data": {
@@ -451,7 +647,7 @@ def fetch_page(url):
     except Exception as e:
         # 发生异常，返回错误响应
         print(f"获取新闻内容失败: {e}")
-        return jsonify({
+        return ojson({
             "code": 500,
             "message": "未爬取成功",
             "data": {
@@ -462,8 +658,9 @@ def fetch_page(url):
 
 
 # 获取单条新闻的详细内容
-# @app.route('/news/item', methods=['GET'])
-# def news_item():
+@app.route('/news/item', methods=['GET'])
+@cache.cached(timeout=3600, query_string=True, response_filter=_is_success_response)
+def news_item():
     """
     获取单条新闻的详细内容
     
@@ -472,7 +669,7 @@ def fetch_page(url):
     # 获取链接参数
     link = request.args.get('link')
     if not link:  # 检查链接参数是否存在
-        return jsonify({
+        return ojson({
             "code": 400,
             "message": "缺少link参数"
         })
@@ -480,275 +677,13 @@ def fetch_page(url):
     try:
         print(f"\n=== 开始获取单条新闻内容 ===")
         
-        # 获取新闻详情页
-        # 增加重试机制
-        max_retries = 3
-        item_page = None
-        for retry in range(max_retries):
-            print(f"获取新闻详情页 (重试 {retry+1}/{max_retries})")
-            item_page = fetch_page(link)  # 获取页面内容
-            if item_page:
-                break
-            
-            print(f"获取新闻详情页失败，等待后重试...")
-            import time
-            time.sleep(2)
-        
-        if not item_page:  # 所有重试都失败
-            raise Exception("无法获取新闻详情页")
-        
-        # 解析新闻详情
-        try:
-            soup = BeautifulSoup(item_page, 'html.parser')  # 解析HTML
-        except Exception as e:
-            print(f"解析HTML失败: {e}")
-            raise Exception("无法解析新闻详情页")
-        
-        # 提取新闻内容
-        news_content = ""  # 初始化新闻内容
-        
-        # 方法1: 尝试不同的内容选择器，覆盖CCTV新闻页面的各种结构
-        content_selectors = [
-            # CCTV新闻常用选择器
-            '.cnt_bd',
-            '#content_body',
-            '.article-body',
-            '.content',
-            '.main-content',
-            '.article_content',
-            '.news-content',
-            '.text-content',
-            '.content-article',
-            '#content',
-            '.detail-content',
-            '.articleDetail',
-            '.newsText',
-            '.text',
-            '.article',
-            '.allcontent',  # 视频新闻的内容容器
-            # 针对视频新闻的选择器
-            '.video-info',
-            '.video-description',
-            '.video-content'
-        ]
-        
-        for selector in content_selectors:
-            try:
-                content_div = soup.select_one(selector)  # 查找内容容器
-                if content_div:  # 如果找到内容容器
-                    temp_content = content_div.get_text(separator='\n', strip=True)  # 获取文本内容
-                    # 检查是否为"加载更多"或内容过短
-                    if temp_content and temp_content.strip() != "加载更多" and len(temp_content) > 50:
-                        news_content = temp_content
-                        break
-            except Exception as e:
-                print(f"使用选择器 {selector} 提取内容失败: {e}")
-                continue
-        
-        # 方法2: 如果方法1失败，尝试从meta标签获取contentid，调用API获取内容
-        if not news_content or news_content.strip() == "加载更多":
-            print("尝试从meta标签获取contentid...")
-            content_id_meta = soup.find('meta', attrs={'name': 'contentid'})  # 查找meta标签
-            
-            if content_id_meta:  # 如果找到meta标签
-                content_id = content_id_meta.get('content', '')  # 获取contentid
-                if content_id:  # contentid存在
-                    print(f"获取到contentid: {content_id}")
-                    # 尝试构造API请求获取内容
-                    # CCTV新闻API通常使用类似的结构
-                    api_urls = [
-                        f"https://api.cctv.com/video/detail?id={content_id}",
-                        f"https://vdn.apps.cntv.cn/api/getHttpVideoInfo.do?pid={content_id}",
-                        f"https://api.cctv.com/content/article/{content_id}"
-                    ]
-                    
-                    for api_url in api_urls:
-                        try:
-                            # 使用fetch_page函数获取API内容，增加重试机制
-                            api_content = fetch_page(api_url)
-                            if api_content:  # API请求成功
-                                # 尝试解析API响应
-                                try:
-                                    import json
-                                    api_data = json.loads(api_content)
-                                    # 从API响应中提取内容
-                                    if isinstance(api_data, dict):
-                                        # 检查常见的内容字段
-                                        content_fields = ['content', 'description', 'body', 'text', 'intro']
-                                        for field in content_fields:
-                                            if field in api_data and api_data[field]:
-                                                news_content = str(api_data[field])
-                                                break
-                                except ValueError:
-                                    # 如果不是JSON，尝试从HTML中提取
-                                    api_soup = BeautifulSoup(api_content, 'html.parser')
-                                    api_text = api_soup.get_text(separator='\n', strip=True)
-                                    if api_text and len(api_text) > 50:
-                                        news_content = api_text
-                                        break
-                        except Exception as api_e:
-                            print(f"API请求失败: {api_e}")
-                            continue
-        
-        # 方法3: 尝试查找所有p标签并拼接内容
-        if not news_content or news_content.strip() == "加载更多":
-            try:
-                paragraphs = soup.find_all('p')  # 查找所有p标签
-                if paragraphs:  # 如果找到p标签
-                    p_content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    if p_content and len(p_content) > 50:
-                        news_content = p_content
-            except Exception as e:
-                print(f"提取p标签内容失败: {e}")
-        
-        # 方法4: 使用通用方法提取，过滤掉过多的空白行
-        if not news_content or news_content.strip() == "加载更多":
-            try:
-                # 使用通用方法提取，过滤掉过多的空白行
-                for script in soup(['script', 'style', 'iframe', 'nav', 'header', 'footer', 'aside']):
-                    script.decompose()  # 移除不需要的标签
-                raw_content = soup.get_text(separator='\n', strip=True)  # 获取文本内容
-                # 清理内容，移除过多的空行
-                news_content = '\n'.join([line for line in raw_content.split('\n') if line.strip()])
-            except Exception as e:
-                print(f"通用方法提取内容失败: {e}")
-        
-        # 方法5: 从页面中提取视频简介
-        if not news_content or news_content.strip() == "加载更多":
-            print("尝试提取视频简介...")
-            try:
-                # 查找包含视频简介的元素
-                all_content_div = soup.find('div', class_='allcontent')
-                if all_content_div:  # 如果找到allcontent标签
-                    # 提取所有文本，但过滤掉无效内容
-                    all_text = all_content_div.get_text(separator='\n', strip=True)
-                    # 清理内容，保留有意义的部分
-                    lines = [line for line in all_text.split('\n') if len(line) > 10]  # 保留长度大于10的行
-                    if lines:  # 如果有符合条件的行
-                        news_content = '\n'.join(lines)
-            except Exception as e:
-                print(f"提取视频简介失败: {e}")
-        
-        # 方法6: 尝试从article标签提取内容
-        if not news_content or news_content.strip() == "加载更多":
-            print("尝试从article标签提取内容...")
-            try:
-                article_tag = soup.find('article')  # 查找article标签
-                if article_tag:  # 如果找到article标签
-                    article_content = article_tag.get_text(separator='\n', strip=True)
-                    if article_content and len(article_content) > 50:
-                        news_content = article_content
-            except Exception as e:
-                print(f"提取article标签内容失败: {e}")
-        
-        # 方法7: 尝试从div[id*='content']提取内容
-        if not news_content or news_content.strip() == "加载更多":
-            print("尝试从包含content的id标签提取内容...")
-            try:
-                content_div = soup.find('div', id=lambda x: x and 'content' in x.lower())  # 查找id包含content的div
-                if content_div:  # 如果找到content标签
-                    content = content_div.get_text(separator='\n', strip=True)
-                    if content and len(content) > 50:
-                        news_content = content
-            except Exception as e:
-                print(f"提取content id标签内容失败: {e}")
-        
-        # 过滤掉不需要的内容
-        if news_content:  # 如果新闻内容存在
-            # 定义要过滤的内容列表
-            filters = [
-                "央视网消息（新闻联播）：",
-                "央视网消息\n（新闻联播）：",
-                "央视网消息\n（新闻联播）：\n",
-                "主要内容",
-                "编辑：",
-                "责任编辑：",
-                "责任",
-                "陈平丽",
-                "刘亮"
-            ]
-            
-            # 执行过滤
-            filtered_content = news_content
-            for filter_text in filters:
-                filtered_content = filtered_content.replace(filter_text, "")  # 替换过滤文本为空格
-            
-            # 清理多余的空行和空白字符
-            lines = [line for line in filtered_content.split("\n") if line.strip()]  # 过滤掉空行
-            filtered_content = "\n".join(lines)  # 重新拼接
-            
-            # 最终清理：移除行尾的多余字符
-            final_lines = []
-            for line in filtered_content.split("\n"):
-                # 移除行尾的空白字符和可能的残留字符
-                cleaned_line = line.strip()
-                if cleaned_line:  # 只保留非空行
-                    final_lines.append(cleaned_line)
-            
-            # 去掉最后面的作者信息
-            # 查找常见的作者标识行
-            author_patterns = [
-                r'^编辑：',
-                r'^责任编辑：',
-                r'^文\s*/\s*',
-                r'^图\s*/\s*',
-                r'^摄影\s*：',
-                r'^记者\s*：',
-                r'^\s*作者\s*：',
-                r'^\s*\w+\s*\w+$'  # 匹配可能的作者姓名行
-            ]
-            
-            # 从后往前检查，移除作者相关行
-            import re
-            cleaned_final_lines = []
-            for line in reversed(final_lines):
-                is_author_line = False  # 标记是否为作者行
-                for pattern in author_patterns:
-                    if re.match(pattern, line):  # 检查是否匹配作者模式
-                        is_author_line = True
-                        break
-                if is_author_line:
-                    continue  # 跳过作者行
-                # 检查是否为简单的中文姓名（2-4个汉字）
-                if re.match(r'^[\u4e00-\u9fa5]{2,4}$', line):
-                    continue  # 跳过简单中文姓名行
-                cleaned_final_lines.append(line)
-            
-            # 反转回来，恢复正常顺序
-            cleaned_final_lines.reverse()
-            
-            # 如果清理后没有内容，保留原始内容
-            if cleaned_final_lines:
-                news_content = "\n".join(cleaned_final_lines)
-            else:
-                news_content = "\n".join(final_lines)
-            
-            # 过滤正文中最后一个句号后的人名（编辑姓名）
-            # 查找最后一个句号的位置
-            last_period_index = news_content.rfind('。')
-            if last_period_index != -1:
-                # 获取最后一个句号后的内容
-                content_after_last_period = news_content[last_period_index + 1:].strip()
-                
-                # 检查最后一个句号后的内容是否为中文姓名（2-4个汉字）
-                import re
-                if re.match(r'^[\u4e00-\u9fa5]{2,4}$', content_after_last_period):
-                    # 如果是中文姓名，移除最后一个句号后的内容
-                    news_content = news_content[:last_period_index + 1].strip()
-                # 也处理英文句号的情况
-                last_dot_index = news_content.rfind('.')
-                if last_dot_index != -1:
-                    content_after_last_dot = news_content[last_dot_index + 1:].strip()
-                    if re.match(r'^[\u4e00-\u9fa5]{2,4}$', content_after_last_dot):
-                        news_content = news_content[:last_dot_index + 1].strip()
-        
-        if not news_content:  # 新闻内容为空
-            raise Exception("无法提取新闻内容")
+        # 获取并解析新闻详情页
+        news_content = fetch_and_parse_item(link)
         
         print(f"成功提取单条新闻内容")
         
         # 返回成功响应
-        return jsonify({
+        return ojson({
             "code": 200,
             "message": "success",
             "data": {
@@ -760,7 +695,7 @@ def fetch_page(url):
     except Exception as e:
         # 发生异常，返回错误响应
         print(f"获取单条新闻内容失败: {e}")
-        return jsonify({
+        return ojson({
             "code": 500,
             "message": "未爬取成功",
             "data": {
@@ -770,18 +705,395 @@ def fetch_page(url):
         })
 
 
+# 批量接口一次最多获取的新闻条数
+_ITEMS_BULK_MAX_LINKS = 50
+
+
+# 批量接口的缓存键函数
+def _items_bulk_cache_key(*args, **kwargs):
+    """
+    按link参数的原始顺序生成缓存键
+    query_string=True会先对参数排序，顺序不同的请求会取到条目顺序错误的缓存结果
+    
+    :return: 缓存键字符串
+    """
+    links = orjson.dumps(request.args.getlist('link'))
+    return f"news_items_bulk:{hashlib.md5(links).hexdigest()}"
+
+
+# 批量获取多条新闻的详细内容
+@app.route('/news/items_bulk', methods=['GET'])
+@cache.cached(timeout=3600, make_cache_key=_items_bulk_cache_key, response_filter=_is_success_response)
+def news_items_bulk():
+    """
+    批量获取多条新闻的详细内容
+    使用线程池并发获取，所有请求共用_SESSION的连接池
+    请求格式：/news/items_bulk?link=URL1&link=URL2，一次最多_ITEMS_BULK_MAX_LINKS条链接
+    
+    :return: JSON格式的新闻详情列表，顺序与link参数一致，获取失败的条目ok为false、error为失败原因
+    """
+    # 获取链接参数
+    links = request.args.getlist('link')
+    if not links:  # 检查链接参数是否存在
+        return ojson({
+            "code": 400,
+            "message": "缺少link参数"
+        })
+    if len(links) > _ITEMS_BULK_MAX_LINKS:  # 拒绝过大的批量请求，避免长时间占用服务并频繁请求CCTV
+        return ojson({
+            "code": 400,
+            "message": f"link参数过多，一次最多{_ITEMS_BULK_MAX_LINKS}条"
+        })
+    
+    def fetch_item_content(item_link):
+        try:
+            return {"content": fetch_and_parse_item(item_link), "link": item_link, "ok": True, "error": None}
+        except Exception as e:
+            print(f"获取单条新闻内容失败: {item_link}, {e}")
+            return {"content": "", "link": item_link, "ok": False, "error": str(e)}
+    
+    print(f"\n=== 开始批量获取 {len(links)} 条新闻内容 ===")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        items = list(executor.map(fetch_item_content, links))
+    
+    # 有条目获取失败时返回500，响应不会被缓存，下次请求重新爬取失败的条目
+    failed = sum(not item["ok"] for item in items)
+    if failed:
+        print(f"批量获取完成，{failed}/{len(items)} 条新闻内容获取失败")
+        return ojson({
+            "code": 500,
+            "message": f"{failed} 条新闻未爬取成功",
+            "data": items
+        })
+    
+    # 返回成功响应
+    return ojson({
+        "code": 200,
+        "message": "success",
+        "data": items
+    })
+
+
+# 并发获取页面函数
+def fetch_first_page(urls, expire_after=None):
+    """
+    并发请求多个候选URL，按urls中的优先级返回第一个获取成功的页面
+    请求是I/O密集型，requests在等待网络时会释放GIL，因此使用线程池即可并行
+    某个URL获取成功后，优先级更低的URL停止重试，不再向服务器发送请求
+    
+    :param urls: 候选URL列表，排在前面的优先级更高
+    :param expire_after: 缓存有效期（秒），含义同fetch_page
+    :return: (url, 页面HTML内容)，全部失败返回(None, None)
+    """
+    cancels = [threading.Event() for _ in urls]  # 每个URL一个取消标志
+    pages = [None] * len(urls)
+    done = [False] * len(urls)
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    try:
+        futures = {
+            executor.submit(fetch_page, url, expire_after, cancel): index
+            for index, (url, cancel) in enumerate(zip(urls, cancels))
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            done[index] = True
+            pages[index] = future.result()
+            if pages[index]:  # 优先级更低的URL已不可能被采用
+                for cancel in cancels[index + 1:]:
+                    cancel.set()
+            
+            # 优先级更高的URL都已失败时，才能采用当前成功的页面
+            for i, page in enumerate(pages):
+                if not done[i]:
+                    break
+                if page:
+                    return urls[i], page
+        return None, None
+    finally:
+        # 返回后仍在进行的请求都已不再需要，通知其停止重试，不等待其结束
+        for cancel in cancels:
+            cancel.set()
+        executor.shutdown(wait=False)
+
+
+# 单条新闻获取与解析函数
+def fetch_and_parse_item(link):
+    """
+    获取新闻详情页并提取正文内容
+    
+    :param link: 新闻链接
+    :return: 清理后的新闻内容
+    :raises Exception: 无法获取、解析或提取新闻内容时抛出
+    """
+    # 获取新闻详情页
+    # 增加重试机制
+    max_retries = 3
+    item_page = None
+    for retry in range(max_retries):
+        print(f"获取新闻详情页 (重试 {retry+1}/{max_retries})")
+        item_page = fetch_page(link, requests_cache.DO_NOT_CACHE)  # 获取页面内容，正文会存入数据库，不缓存页面
+        if item_page:
+            break
+        
+        print(f"获取新闻详情页失败，等待后重试...")
+        time.sleep(2)
+    
+    if not item_page:  # 所有重试都失败
+        raise Exception("无法获取新闻详情页")
+    
+    # 解析新闻详情
+    try:
+        soup = BeautifulSoup(item_page, HTML_PARSER, parse_only=_ITEM_STRAINER)  # 解析HTML
+    except Exception as e:
+        print(f"解析HTML失败: {e}")
+        raise Exception("无法解析新闻详情页")
+    
+    # 提取新闻内容
+    news_content = ""  # 初始化新闻内容
+    
+    # 方法1: 尝试不同的内容选择器，覆盖CCTV新闻页面的各种结构
+    content_selectors = [
+        # CCTV新闻常用选择器
+        '.cnt_bd',
+        '#content_body',
+        '.article-body',
+        '.content',
+        '.main-content',
+        '.article_content',
+        '.news-content',
+        '.text-content',
+        '.content-article',
+        '#content',
+        '.detail-content',
+        '.articleDetail',
+        '.newsText',
+        '.text',
+        '.article',
+        '.allcontent',  # 视频新闻的内容容器
+        # 针对视频新闻的选择器
+        '.video-info',
+        '.video-description',
+        '.video-content'
+    ]
+    
+    for selector in content_selectors:
+        try:
+            content_div = soup.select_one(selector)  # 查找内容容器
+            if content_div:  # 如果找到内容容器
+                temp_content = content_div.get_text(separator='\n', strip=True)  # 获取文本内容
+                # 检查是否为"加载更多"或内容过短
+                if temp_content and temp_content.strip() != "加载更多" and len(temp_content) > 50:
+                    news_content = temp_content
+                    break
+        except Exception as e:
+            print(f"使用选择器 {selector} 提取内容失败: {e}")
+            continue
+    
+    # 方法2: 如果方法1失败，尝试从meta标签获取contentid，调用API获取内容
+    if not news_content or news_content.strip() == "加载更多":
+        print("尝试从meta标签获取contentid...")
+        content_id_meta = soup.find('meta', attrs={'name': 'contentid'})  # 查找meta标签
+        
+        if content_id_meta:  # 如果找到meta标签
+            content_id = content_id_meta.get('content', '')  # 获取contentid
+            if content_id:  # contentid存在
+                print(f"获取到contentid: {content_id}")
+                # 尝试构造API请求获取内容
+                # CCTV新闻API通常使用类似的结构
+                api_urls = [
+                    f"https://api.cctv.com/video/detail?id={content_id}",
+                    f"https://vdn.apps.cntv.cn/api/getHttpVideoInfo.do?pid={content_id}",
+                    f"https://api.cctv.com/content/article/{content_id}"
+                ]
+                
+                for api_url in api_urls:
+                    try:
+                        # 使用fetch_page函数获取API内容，增加重试机制
+                        api_content = fetch_page(api_url, requests_cache.DO_NOT_CACHE)
+                        if api_content:  # API请求成功
+                            # 尝试解析API响应
+                            try:
+                                api_data = orjson.loads(api_content)
+                                # 从API响应中提取内容
+                                if isinstance(api_data, dict):
+                                    # 检查常见的内容字段
+                                    content_fields = ['content', 'description', 'body', 'text', 'intro']
+                                    for field in content_fields:
+                                        if field in api_data and api_data[field]:
+                                            news_content = str(api_data[field])
+                                            break
+                            except ValueError:
+                                # 如果不是JSON，尝试从HTML中提取
+                                api_soup = BeautifulSoup(api_content, HTML_PARSER)
+                                api_text = api_soup.get_text(separator='\n', strip=True)
+                                if api_text and len(api_text) > 50:
+                                    news_content = api_text
+                                    break
+                    except Exception as api_e:
+                        print(f"API请求失败: {api_e}")
+                        continue
+    
+    # 方法3和方法4使用的lxml树，需要时才解析
+    item_tree = None
+    
+    # 方法3: 尝试查找所有p标签并拼接内容
+    if not news_content or news_content.strip() == "加载更多":
+        try:
+            if lxml_html is not None:
+                # lxml的text_content()一次C调用即可取得全部文本
+                item_tree = lxml_html.fromstring(item_page)
+                p_content = '\n'.join(filter(None, (p.text_content().strip() for p in item_tree.iter('p'))))
+            else:
+                paragraphs = soup.find_all('p')  # 查找所有p标签
+                p_content = '\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+            if p_content and len(p_content) > 50:
+                news_content = p_content
+        except Exception as e:
+            print(f"提取p标签内容失败: {e}")
+    
+    # 方法4: 使用通用方法提取，过滤掉过多的空白行
+    if not news_content or news_content.strip() == "加载更多":
+        try:
+            if lxml_html is not None:
+                # 在lxml树上一次性移除不需要的标签和注释，再直接拼接非空文本
+                if item_tree is None:
+                    item_tree = lxml_html.fromstring(item_page)
+                etree.strip_elements(item_tree, etree.Comment, 'script', 'style', 'iframe', 'nav', 'header', 'footer', 'aside', with_tail=False)
+                news_content = '\n'.join(filter(None, (text.strip() for text in item_tree.itertext())))
+            else:
+                # 使用通用方法提取，过滤掉过多的空白行
+                for script in soup(['script', 'style', 'iframe', 'nav', 'header', 'footer', 'aside']):
+                    script.decompose()  # 移除不需要的标签
+                raw_content = soup.get_text(separator='\n', strip=True)  # 获取文本内容
+                # 清理内容，移除过多的空行
+                news_content = '\n'.join([line for line in raw_content.split('\n') if line.strip()])
+        except Exception as e:
+            print(f"通用方法提取内容失败: {e}")
+    
+    # 方法5: 从页面中提取视频简介
+    if not news_content or news_content.strip() == "加载更多":
+        print("尝试提取视频简介...")
+        try:
+            # 查找包含视频简介的元素
+            all_content_div = soup.find('div', class_='allcontent')
+            if all_content_div:  # 如果找到allcontent标签
+                # 提取所有文本，但过滤掉无效内容
+                all_text = all_content_div.get_text(separator='\n', strip=True)
+                # 清理内容，保留有意义的部分
+                lines = [line for line in all_text.split('\n') if len(line) > 10]  # 保留长度大于10的行
+                if lines:  # 如果有符合条件的行
+                    news_content = '\n'.join(lines)
+        except Exception as e:
+            print(f"提取视频简介失败: {e}")
+    
+    # 方法6: 尝试从article标签提取内容
+    if not news_content or news_content.strip() == "加载更多":
+        print("尝试从article标签提取内容...")
+        try:
+            article_tag = soup.find('article')  # 查找article标签
+            if article_tag:  # 如果找到article标签
+                article_content = article_tag.get_text(separator='\n', strip=True)
+                if article_content and len(article_content) > 50:
+                    news_content = article_content
+        except Exception as e:
+            print(f"提取article标签内容失败: {e}")
+    
+    # 方法7: 尝试从div[id*='content']提取内容
+    if not news_content or news_content.strip() == "加载更多":
+        print("尝试从包含content的id标签提取内容...")
+        try:
+            content_div = soup.select_one('div[id*="content" i]')  # 查找id包含content的div，不区分大小写
+            if content_div:  # 如果找到content标签
+                content = content_div.get_text(separator='\n', strip=True)
+                if content and len(content) > 50:
+                    news_content = content
+        except Exception as e:
+            print(f"提取content id标签内容失败: {e}")
+    
+    # 过滤掉不需要的内容
+    if news_content:  # 如果新闻内容存在
+        # 执行过滤，一次扫描移除所有需要过滤的文本
+        filtered_content = _RE_ITEM_FILTER.sub("", news_content)
+        
+        # 清理多余的空行和行首尾的空白字符
+        final_lines = [line.strip() for line in filtered_content.split("\n") if line.strip()]
+        
+        # 去掉最后面的作者信息：从后往前跳过作者标识行和简单中文姓名行，遇到正文即停止
+        cut = len(final_lines)
+        while cut > 0 and (_RE_AUTHOR.match(final_lines[cut - 1]) or _RE_CN_NAME.fullmatch(final_lines[cut - 1])):
+            cut -= 1
+        
+        # 如果清理后没有内容，保留原始内容
+        if cut > 0:
+            final_lines = final_lines[:cut]
+            # 过滤正文最后一个句号后的人名（编辑姓名），如"……。张三"
+            final_lines[-1] = _RE_TAIL_NAME.sub('', final_lines[-1])
+        news_content = "\n".join(final_lines)
+    
+    if not news_content:  # 新闻内容为空
+        raise Exception("无法提取新闻内容")
+    
+    return news_content
+
+
+# 从数据库查询指定日期的新闻列表，返回序列化后的响应体
+def _query_news_list_body(conn, date):
+    """
+    查询指定日期的新闻列表，并序列化为成功响应的JSON字节串
+    
+    :param conn: 数据库连接
+    :param date: 日期字符串，格式为YYYY-MM-DD
+    :return: (响应体字节串, 新闻条数)
+    """
+    cursor = conn.cursor()  # 获取游标
+    
+    # 查询指定日期的新闻
+    query = """
+    SELECT id, date, title, item_number, link
+    FROM `news_联播` 
+    WHERE date = ? 
+    ORDER BY item_index ASC
+    """
+    
+    print(f"执行查询: {query}，参数: {date}")
+    cursor.execute(query, (date,))  # 执行查询
+    news_rows = cursor.fetchall()  # 获取查询结果
+    
+    print(f"查询结果: {len(news_rows)} 条新闻")
+    
+    # 将Row对象转换为字典列表
+    news_items = []
+    for row in news_rows:
+        news_items.append(dict(row))  # 转换为字典
+    
+    cursor.close()  # 关闭游标，连接在请求结束时放回连接池，不在此关闭
+    
+    # 序列化成功响应
+    body = orjson.dumps({
+        "code": 200,
+        "message": "success",
+        "data": {
+            "date": date,
+            "items": news_items
+        }
+    })
+    return body, len(news_items)
+
+
 # 从数据库获取指定日期的新闻列表
 @app.route('/db/news_list', methods=['GET'])
 def db_news_list():
     """
     从数据库获取指定日期的新闻列表
+    今天之前的日期数据不会再变化，有数据时响应体缓存在进程内，并允许客户端缓存1天
+    响应带有ETag，客户端携带If-None-Match且内容未变化时返回304
     
     :return: JSON格式的新闻列表
     """
     # 获取日期参数
     date = request.args.get('date')
     if not date:  # 检查日期参数是否存在
-        return jsonify({
+        return ojson({
             "code": 400,
             "message": "缺少date参数"
         })
@@ -789,53 +1101,42 @@ def db_news_list():
     print(f"收到请求：/db/news_list?date={date}")
     
     try:
-        conn = get_db_connection()  # 获取数据库连接
-        if not conn:  # 连接失败
-            print(f"数据库连接失败")
-            return jsonify({
-                "code": 500,
-                "message": "数据库连接失败"
-            })
+        # 今天之前的日期视为历史数据，YYYY-MM-DD格式的字符串可以直接比较大小
+        is_history = date < datetime.now().strftime('%Y-%m-%d')
+        cache_key = f"db_news_list:{date}"
         
-        cursor = conn.cursor()  # 获取游标
-        
-        # 查询指定日期的新闻
-        query = """
-        SELECT id, date, title, item_number, link
-        FROM `news_联播` 
-        WHERE date = ? 
-        ORDER BY CAST(SUBSTRING(item_number, '/', 1) AS INTEGER) ASC
-        """
-        
-        print(f"执行查询: {query}，参数: {date}")
-        cursor.execute(query, (date,))  # 执行查询
-        news_rows = cursor.fetchall()  # 获取查询结果
-        
-        print(f"查询结果: {len(news_rows)} 条新闻")
-        
-        # 将Row对象转换为字典列表
-        news_items = []
-        for row in news_rows:
-            news_items.append(dict(row))  # 转换为字典
-        
-        cursor.close()  # 关闭游标
-        conn.close()  # 关闭连接
+        # 历史日期优先使用缓存的响应体，跳过数据库查询和序列化
+        body = cache.get(cache_key) if is_history else None
+        if body is None:
+            conn = get_db_connection()  # 获取数据库连接
+            if not conn:  # 连接失败
+                print(f"数据库连接失败")
+                return ojson({
+                    "code": 500,
+                    "message": "数据库连接失败"
+                })
+            
+            body, count = _query_news_list_body(conn, date)
+            # 只缓存已有数据的历史日期，避免缓存尚未爬取日期的空结果
+            if is_history and count:
+                cache.set(cache_key, body, timeout=0)
         
-        # 返回成功响应
-        return jsonify({
-            "code": 200,
-            "message": "success",
-            "data": {
-                "date": date,
-                "items": news_items
-            }
-        })
+        # 根据响应体计算ETag，内容未变化时返回304，不再发送响应体
+        etag = hashlib.md5(body).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        # 历史日期允许客户端和代理缓存1天，当天数据每次都需要重新验证
+        response.headers['Cache-Control'] = 'public, max-age=86400' if is_history else 'no-cache'
+        return response
         
     except Exception as e:  # 发生异常
         print(f"从数据库获取新闻列表失败: {e}")
         import traceback
         traceback.print_exc()  # 打印堆栈信息
-        return jsonify({
+        return ojson({
             "code": 500,
             "message": f"从数据库获取新闻列表失败: {str(e)}",
             "data": {
@@ -856,7 +1157,7 @@ def db_news_detail():
     # 获取新闻ID参数
     news_id = request.args.get('id')
     if not news_id:  # 检查ID参数是否存在
-        return jsonify({
+        return ojson({
             "code": 400,
             "message": "缺少id参数"
         })
@@ -864,16 +1165,20 @@ def db_news_detail():
     try:
         conn = get_db_connection()  # 获取数据库连接
         if not conn:  # 连接失败
-            return jsonify({
+            return ojson({
                 "code": 500,
                 "message": "数据库连接失败"
             })
         
         cursor = conn.cursor()  # 获取游标
         
-        # 查询指定ID的新闻
-        query = """
-        SELECT id, date, title, content, item_number
+        # 查询指定ID的新闻，未迁移的旧表没有content_zstd列，内容都在content列中
+        if 'content_zstd' in news_table_columns(conn):
+            content_zstd_column = 'content_zstd'
+        else:
+            content_zstd_column = 'NULL AS content_zstd'
+        query = f"""
+        SELECT id, date, title, content, {content_zstd_column}, item_number
         FROM `news_联播` 
         WHERE id = ?
         """
@@ -881,20 +1186,23 @@ def db_news_detail():
         cursor.execute(query, (news_id,))  # 执行查询
         news_row = cursor.fetchone()  # 获取查询结果
         
-        cursor.close()  # 关闭游标
-        conn.close()  # 关闭连接
+        cursor.close()  # 关闭游标，连接在请求结束时放回连接池，不在此关闭
         
         if not news_row:  # 新闻不存在
-            return jsonify({
+            return ojson({
                 "code": 404,
                 "message": "新闻不存在"
             })
         
         # 将Row对象转换为字典
         news_item = dict(news_row)
+        # 新数据的内容以zstd压缩后存放在content_zstd列，解压后放回content字段
+        content_zstd = news_item.pop('content_zstd')
+        if content_zstd:
+            news_item['content'] = zstd.ZstdDecompressor().decompress(content_zstd).decode('utf-8')
         
         # 返回成功响应
-        return jsonify({
+        return ojson({
             "code": 200,
             "message": "success",
             "data": news_item
@@ -902,7 +1210,7 @@ def db_news_detail():
         
     except Exception as e:  # 发生异常
         print(f"从数据库获取新闻详情失败: {e}")
-        return jsonify({
+        return ojson({
             "code": 500,
             "message": f"从数据库获取新闻详情失败: {str(e)}",
             "data": {}
@@ -7,30 +7,41 @@
 
 # 导入必要的模块
 import datetime  # 用于日期处理
-import subprocess  # 用于执行外部命令
 import os  # 用于文件路径处理
+import functools  # 用于缓存已加载的配置和绑定爬虫实例参数
 import logging  # 用于日志记录
+import logging.handlers  # 用于队列日志处理器
+import queue  # 用于日志队列
+import atexit  # 用于程序退出时停止日志线程
+from concurrent.futures import ThreadPoolExecutor  # 用于并发处理多个日期
 import yaml  # 用于解析YAML配置文件
 
+# YAML加载器，优先使用libyaml的C实现，未安装时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # 加载配置文件
+@functools.lru_cache(maxsize=1)
 def load_config():
     """
     加载配置文件
+    解析结果会被缓存，同一进程内重复调用不会再次读取和解析文件
     
     :return: 配置字典
     """
     config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
     except Exception as e:
         print(f"加载配置文件失败: {e}")
         # 返回默认配置
         return {
             'batch': {
-                'python_path': 'python.exe',
-                'main_script': 'news_to_sqlite.py',
-                'default_start_date': '2022-01-01'
+                'default_start_date': '2022-01-01',
+                'parallelism': 8
             },
             'logging': {
                 'level': 'INFO',
@@ -42,16 +53,26 @@ def load_config():
 config = load_config()
 
 # 配置日志系统
+# 记录日志时只把日志放入内存队列，由后台线程写入文件和控制台，避免在处理循环中同步写文件
+_log_queue = queue.Queue(-1)  # 日志队列，不限长度
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler(config['logging']['batch_log_file'], encoding='utf-8'),  # 日志文件输出，使用utf-8编码
+    logging.StreamHandler()  # 控制台输出
+)
 logging.basicConfig(
     level=getattr(logging, config['logging']['level'], logging.INFO),  # 日志级别，使用配置文件中的值
     format='%(asctime)s - %(levelname)s - %(message)s',  # 日志格式，包含时间、级别和消息
-    handlers=[
-        logging.FileHandler(config['logging']['batch_log_file'], encoding='utf-8'),  # 日志文件输出，使用utf-8编码
-        logging.StreamHandler()  # 控制台输出
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]  # 日志先放入队列
 )
+_log_listener.start()  # 启动后台写日志线程
+atexit.register(_log_listener.stop)  # 程序退出时写完队列中剩余的日志
 logger = logging.getLogger(__name__)  # 获取日志记录器实例
 
+# 在本进程内直接调用爬虫，不再为每个日期启动子进程
+# 需在上面的日志配置之后导入，保证日志仍写入批量运行日志文件
+from news_to_sqlite import NewsToSQLite
+
 class BatchRunner:
     """
     批量执行新闻联播爬虫的类
@@ -66,22 +87,19 @@ class BatchRunner:
         # 获取当前脚本所在目录的绝对路径
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         
-        # 主爬虫脚本的完整路径，news_to_sqlite.py用于爬取单天新闻
-        self.main_script = os.path.join(self.script_dir, config['batch']['main_script'])
-        
         # SQLite数据库文件的完整路径
         self.db_path = os.path.join(self.script_dir, config['database']['path'])
         
         # 记录初始化日志
         logger.info(f"=== 批量爬虫程序初始化 ===")
-        logger.info(f"主脚本: {self.main_script}")
         logger.info(f"数据库: {self.db_path}")
         logger.info(f"脚本目录: {self.script_dir}")
         
-    def run_single_date(self, date_str):
+    def run_single_date(self, spider, date_str):
         """
         执行单个日期的爬虫程序
         
+        :param spider: 已连接数据库并建好表的NewsToSQLite实例，所有日期共用
         :param date_str: 日期字符串，格式为YYYY-MM-DD
         :return: bool 是否执行成功，True表示成功，False表示失败
         """
@@ -89,48 +107,12 @@ class BatchRunner:
             # 记录开始处理日志
             logger.info(f"开始处理日期: {date_str}")
             
-            # 构建执行命令列表
-            # 命令格式：python.exe news_to_sqlite.py --date YYYY-MM-DD --db news.db
-            cmd = [
-                # Python解释器路径，使用配置文件中的路径
-                config['batch']['python_path'],
-                self.main_script,  # 主爬虫脚本
-                '--date', date_str,  # 日期参数
-                '--db', self.db_path  # 数据库路径参数
-            ]
-            
-            # 记录执行命令日志，将命令列表转换为字符串便于查看
-            logger.info(f"执行命令: {' '.join(cmd)}")
-            
-            # 执行命令，捕获输出和错误
-            # subprocess.run()用于执行外部命令
-            # capture_output=True 捕获标准输出和标准错误
-            # text=True 将输出转换为字符串格式
-            # cwd=self.script_dir 设置命令执行的工作目录
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=self.script_dir)
-            
-            # 检查命令执行结果
-            if result.returncode == 0:  # returncode为0表示命令执行成功
+            # 复用同一个爬虫实例的数据库连接和HTTP会话处理该日期
+            if spider.run_one(date_str):
                 logger.info(f"✅ 日期 {date_str} 处理成功")
-                
-                # 如果有标准输出，记录为debug级别日志
-                if result.stdout:
-                    logger.debug(f"输出: {result.stdout}")
-                
-                # 如果有标准错误，记录为warning级别日志
-                if result.stderr:
-                    logger.warning(f"警告输出: {result.stderr}")
-                
                 return True  # 返回执行成功
-            else:  # returncode不为0表示命令执行失败
-                logger.error(f"❌ 日期 {date_str} 处理失败，返回码: {result.returncode}")
-                
-                # 记录错误信息
-                if result.stdout:
-                    logger.error(f"输出: {result.stdout}")
-                if result.stderr:
-                    logger.error(f"错误: {result.stderr}")
-                
+            else:
+                logger.error(f"❌ 日期 {date_str} 处理失败")
                 return False  # 返回执行失败
                 
         except Exception as e:  # 捕获所有异常
@@ -160,29 +142,35 @@ class BatchRunner:
             logger.info(f"日期范围: {start_date} 至 {end_date}")
             logger.info(f"总天数: {((end - start).days + 1)} 天")
             
-            # 初始化统计变量
-            total_days = 0  # 总处理天数
-            success_days = 0  # 处理成功天数
-            failed_days = 0  # 处理失败天数
-            skipped_days = 0  # 跳过天数
+            # 预先生成日期范围内所有日期字符串
+            dates = [
+                (start + datetime.timedelta(days=offset)).strftime('%Y-%m-%d')
+                for offset in range((end - start).days + 1)
+            ]
             
-            # 循环处理每一天
-            current_date = start  # 当前处理日期，初始为开始日期
-            while current_date <= end:  # 循环条件：当前日期小于等于结束日期
-                date_str = current_date.strftime('%Y-%m-%d')  # 格式化日期为字符串
-                total_days += 1  # 总天数+1
-                
-                # 执行单个日期的爬虫程序
-                if self.run_single_date(date_str):
-                    success_days += 1  # 成功天数+1
-                else:
-                    failed_days += 1  # 失败天数+1
-                
-                # 增加一天，处理下一天
-                current_date += datetime.timedelta(days=1)
+            # 每个日期写入不同的数据行，可以并发处理
+            # 每个任务的耗时主要在等待HTTP响应，使用线程池即可
+            parallelism = max(1, int(config['batch'].get('parallelism', 8)))
+            logger.info(f"并发数: {parallelism}")
+            
+            # 所有日期共用一个爬虫实例，只连接数据库和建表一次，HTTP连接池按并发日期数扩大
+            spider = NewsToSQLite(db_path=self.db_path, concurrent_dates=parallelism)
+            try:
+                if not spider.connect() or not spider.create_table():
+                    logger.error("初始化数据库失败")
+                    return False
                 
-                # 注释掉的延迟，如需避免请求过快可取消注释
-                # time.sleep(0.5)
+                with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                    results = list(executor.map(functools.partial(self.run_single_date, spider), dates))
+            finally:
+                # 无论执行成功与否，都要关闭数据库连接
+                spider.close()
+            
+            # 统计处理结果
+            total_days = len(results)  # 总处理天数
+            success_days = sum(results)  # 处理成功天数
+            failed_days = total_days - success_days  # 处理失败天数
+            skipped_days = 0  # 跳过天数
             
             # 计算成功率
             success_rate = success_days / total_days * 100 if total_days > 0 else 0
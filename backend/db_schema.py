@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+新闻数据库表结构
+功能：创建新闻表和索引，并把旧版本创建的表迁移到最新结构
+backend服务和爬虫程序共用，无论哪个程序先打开数据库，表结构都是最新的
+"""
+
+# 导入必要的模块
+import sqlite3  # 用于SQLite数据库操作
+import logging  # 用于日志记录
+
+logger = logging.getLogger(__name__)  # 获取日志记录器实例
+
+# 表结构版本号，保存在数据库文件的user_version中，表结构变化时加1
+SCHEMA_VERSION = 2
+
+# 创建新闻表的SQL语句
+# IF NOT EXISTS 表示如果表已存在则不创建
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS news_联播 (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,  -- 主键，自动递增
+    date TEXT NOT NULL,  -- 新闻日期，格式为YYYY-MM-DD
+    title TEXT NOT NULL,  -- 新闻标题
+    link TEXT NOT NULL UNIQUE,  -- 新闻链接，唯一约束，避免重复
+    item_number TEXT NOT NULL,  -- 新闻条目编号，格式：1/16
+    item_index INTEGER,  -- 新闻条目序号，从1开始，用于按序排序
+    total_items INTEGER NOT NULL,  -- 当日新闻总条数
+    content TEXT NOT NULL,  -- 新闻内容，内容压缩存放在content_zstd时为空字符串
+    content_zstd BLOB,  -- zstd压缩后的新闻内容（UTF-8编码）
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- 创建时间，自动生成
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP  -- 更新时间，自动生成
+);
+"""
+
+
+def ensure_schema(conn):
+    """
+    确保新闻表和索引为最新结构
+    数据库已是最新版本时只读取一次user_version即返回
+    
+    :param conn: 数据库连接，需为isolation_level=None的自动提交模式，由本函数显式开启事务
+    :return: bool 本次是否执行了建表或迁移
+    :raises sqlite3.Error: 建表或迁移失败时抛出，未完成的修改已回滚
+    """
+    if conn.execute("PRAGMA user_version;").fetchone()[0] >= SCHEMA_VERSION:
+        return False
+    
+    # 建表、迁移和建索引放在同一个写事务中，只提交一次
+    # 立即获取写锁，其他进程同时初始化时会等待本次完成，之后读到的是迁移后的表结构
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # 获取写锁后再检查一次，等待期间其他进程可能已经完成迁移
+        if conn.execute("PRAGMA user_version;").fetchone()[0] >= SCHEMA_VERSION:
+            conn.execute("COMMIT")
+            return False
+        
+        # 执行创建表的SQL语句
+        conn.execute(CREATE_TABLE_SQL)
+        
+        # 旧版本创建的表没有item_index列，补充该列并根据item_number回填序号
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(news_联播);")]
+        if 'item_index' not in columns:
+            conn.execute("ALTER TABLE news_联播 ADD COLUMN item_index INTEGER;")
+            conn.execute(
+                "UPDATE news_联播 SET item_index = "
+                "CAST(substr(item_number, 1, instr(item_number, '/') - 1) AS INTEGER);"
+            )
+            logger.info("已为新闻表补充item_index列")
+        # 旧版本创建的表没有content_zstd列，补充该列，已有数据仍保留在content列中
+        if 'content_zstd' not in columns:
+            conn.execute("ALTER TABLE news_联播 ADD COLUMN content_zstd BLOB;")
+            logger.info("已为新闻表补充content_zstd列")
+        
+        # 创建索引，提高查询效率
+        # 新闻列表查询的覆盖索引，按日期查询并按条目序号排序，查询的列都在索引中，无需再回表读取数据行
+        # 索引中自带rowid，id列无需再列出
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_news_list_cover "
+            "ON news_联播(date, item_index, title, link, item_number);"
+        )
+        # 删除不再需要的索引，每次插入少维护几个索引
+        # 标题索引没有查询使用；按日期的索引和按日期、序号的索引已被覆盖索引替代（覆盖索引以date开头）
+        # 链接的UNIQUE约束自带索引，单独的链接索引是重复的
+        conn.execute("DROP INDEX IF EXISTS idx_title;")
+        conn.execute("DROP INDEX IF EXISTS idx_date_itemidx;")
+        conn.execute("DROP INDEX IF EXISTS idx_date;")
+        conn.execute("DROP INDEX IF EXISTS idx_link;")
+        
+        # 记录表结构版本，之后打开数据库时直接跳过
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        
+        # 提交事务
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        # 回滚未完成的建表和迁移
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    
+    logger.info("新闻表和索引已更新到版本%s", SCHEMA_VERSION)
+    return True
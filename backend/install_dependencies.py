@@ -8,6 +8,16 @@
 import subprocess
 import sys
 import os
+import shutil
+import hashlib
+
+
+# 已安装依赖的哈希值记录文件，每行记录一个Python解释器路径及其安装时的依赖文件哈希值
+# 虚拟环境中放在环境目录下，环境删除重建后记录随之消失；系统解释器的目录通常不可写，放在项目目录下
+if sys.prefix != sys.base_prefix:
+    DEPS_HASH_FILE = os.path.join(sys.prefix, '.deps_hash')
+else:
+    DEPS_HASH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.deps_hash')
 
 
 def check_python_version():
@@ -55,17 +65,80 @@ def install_pip():
             return False
 
 
+def file_hash(path):
+    """
+    计算文件内容的SHA-256哈希值
+    
+    :param path: 文件路径
+    :return: str 十六进制哈希值
+    """
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_deps_hashes():
+    """
+    读取各Python解释器上次安装依赖时记录的依赖文件哈希值
+    
+    :return: dict 解释器路径到哈希值的映射，文件不存在时为空字典
+    """
+    hashes = {}
+    try:
+        with open(DEPS_HASH_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                executable, sep, deps_hash = line.rstrip('\n').rpartition('\t')
+                if sep:
+                    hashes[executable] = deps_hash
+    except OSError:
+        pass
+    return hashes
+
+
+def deps_up_to_date(deps_hash):
+    """
+    检查当前Python解释器已安装的依赖是否与依赖文件一致
+    
+    :param deps_hash: 依赖文件的哈希值
+    :return: bool 哈希值与当前解释器上次安装时记录的一致返回True
+    """
+    return load_deps_hashes().get(sys.executable) == deps_hash
+
+
+def save_deps_hash(deps_hash):
+    """
+    记录当前Python解释器本次安装的依赖文件哈希值，下次运行时哈希值未变化则跳过安装
+    
+    :param deps_hash: 依赖文件的哈希值
+    """
+    hashes = load_deps_hashes()
+    hashes[sys.executable] = deps_hash
+    try:
+        with open(DEPS_HASH_FILE, 'w', encoding='utf-8') as f:
+            for executable, value in hashes.items():
+                f.write(f"{executable}\t{value}\n")
+    except OSError as e:
+        print(f"⚠ 无法写入依赖哈希文件 {DEPS_HASH_FILE}: {e}")
+
+
 def install_dependencies(requirements_file):
     """
-    从requirements.txt文件安装依赖
+    从依赖文件安装依赖
+    已安装uv时使用uv安装，锁定文件使用uv pip sync与环境精确同步；否则使用pip安装
     
-    :param requirements_file: requirements.txt文件路径
+    :param requirements_file: requirements.lock或requirements.txt文件路径
     :return: bool 是否安装成功
     """
     try:
         print(f"正在从 {requirements_file} 安装依赖...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "-r", requirements_file], 
-                      check=True)
+        uv = shutil.which("uv")
+        if uv and requirements_file.endswith(".lock"):
+            # 锁定文件已包含全部解析好的版本，直接同步，无需再次解析依赖
+            cmd = [uv, "pip", "sync", "--python", sys.executable, requirements_file]
+        elif uv:
+            cmd = [uv, "pip", "install", "--python", sys.executable, "-r", requirements_file]
+        else:
+            cmd = [sys.executable, "-m", "pip", "install", "-r", requirements_file]
+        subprocess.run(cmd, check=True)
         print("✓ 所有依赖安装成功")
         return True
     except subprocess.CalledProcessError as e:
@@ -83,23 +156,34 @@ def main():
     if not check_python_version():
         sys.exit(1)
     
-    # 安装或升级pip
-    if not install_pip():
-        sys.exit(1)
-    
-    # 获取requirements.txt文件路径
+    # 获取依赖文件路径，优先使用锁定版本的requirements.lock
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    requirements_file = os.path.join(current_dir, "requirements.txt")
+    requirements_file = os.path.join(current_dir, "requirements.lock")
+    if not os.path.exists(requirements_file):
+        requirements_file = os.path.join(current_dir, "requirements.txt")
     
     # 检查requirements.txt文件是否存在
     if not os.path.exists(requirements_file):
         print(f"✗ 未找到requirements.txt文件: {requirements_file}")
         sys.exit(1)
     
+    # 依赖文件自上次安装后未变化，跳过安装，避免每次都访问PyPI
+    deps_hash = file_hash(requirements_file)
+    if deps_up_to_date(deps_hash):
+        print(f"✓ 依赖已是最新，跳过安装（删除 {DEPS_HASH_FILE} 可强制重新安装）")
+        return
+    
+    # 未安装uv时使用pip，需要先安装或升级pip
+    if not shutil.which("uv") and not install_pip():
+        sys.exit(1)
+    
     # 安装依赖
     if not install_dependencies(requirements_file):
         sys.exit(1)
     
+    # 记录本次安装的依赖文件哈希值
+    save_deps_hash(deps_hash)
+    
     print("\n=== 安装完成 ===")
     print("所有依赖已成功安装，可以开始运行项目了！")
     
@@ -7,26 +7,44 @@
 
 # 导入必要的模块
 import requests  # 用于发送HTTP请求，获取网页内容
+from requests.adapters import HTTPAdapter  # 用于配置HTTP连接池
+from concurrent.futures import ThreadPoolExecutor, as_completed  # 用于并发获取新闻内容
 import sqlite3  # 用于SQLite数据库操作
-import time  # 用于添加延迟，避免请求过快
+import threading  # 用于多个日期并发处理时串行化数据库操作
 import argparse  # 用于解析命令行参数
 import logging  # 用于日志记录
+import logging.handlers  # 用于队列日志处理器
+import queue  # 用于日志队列
+import atexit  # 用于程序退出时停止日志线程
 import re  # 用于正则表达式匹配，清理新闻内容
 import os  # 用于文件路径处理
+import time  # 用于控制请求间隔
+import functools  # 用于缓存已加载的配置
 from datetime import datetime  # 用于处理日期和时间
 import yaml  # 用于解析YAML配置文件
+import orjson  # 用于快速解析JSON响应
+import zstandard as zstd  # 用于压缩存储新闻内容
+from db_schema import ensure_schema  # 新闻表结构，与backend服务共用
+
+# YAML加载器，优先使用libyaml的C实现，未安装时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 # 加载配置文件
+@functools.lru_cache(maxsize=1)
 def load_config():
     """
     加载配置文件
+    解析结果会被缓存，同一进程内重复调用不会再次读取和解析文件
     
     :return: 配置字典
     """
     config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
     except Exception as e:
         print(f"加载配置文件失败: {e}")
         # 返回默认配置
@@ -34,7 +52,8 @@ def load_config():
             'spider': {
                 'backend_url': 'http://localhost:5001',
                 'request_timeout': 10,
-                'request_delay': 0.5
+                'request_delay': 0.5,
+                'max_workers': 8
             },
             'database': {'path': 'news.db'},
             'logging': {
@@ -47,31 +66,95 @@ def load_config():
 config = load_config()
 
 # 配置日志系统
-logging.basicConfig(
-    level=getattr(logging, config['logging']['level'], logging.INFO),  # 日志级别，使用配置文件中的值
-    format='%(asctime)s - %(levelname)s - %(message)s',  # 日志格式，包含时间、级别和消息
-    handlers=[
+# 记录日志时只把日志放入内存队列，由后台线程写入文件和控制台，避免在处理循环中同步写文件
+# 被batch_run导入时根日志记录器已配置好，沿用其日志配置
+if not logging.getLogger().handlers:
+    _log_queue = queue.Queue(-1)  # 日志队列，不限长度
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue,
         logging.FileHandler(config['logging']['news_log_file'], encoding='utf-8'),  # 日志文件输出，使用utf-8编码
         logging.StreamHandler()  # 控制台输出
-    ]
-)
+    )
+    logging.basicConfig(
+        level=getattr(logging, config['logging']['level'], logging.INFO),  # 日志级别，使用配置文件中的值
+        format='%(asctime)s - %(levelname)s - %(message)s',  # 日志格式，包含时间、级别和消息
+        handlers=[logging.handlers.QueueHandler(_log_queue)]  # 日志先放入队列
+    )
+    _log_listener.start()  # 启动后台写日志线程
+    atexit.register(_log_listener.stop)  # 程序退出时写完队列中剩余的日志
 logger = logging.getLogger(__name__)  # 获取日志记录器实例
 
+# 清理新闻内容用的正则表达式，模块加载时预编译
+_TAG_RE = re.compile(r'<[^>]+>')  # HTML标签
+# 特殊字符和乱码的删除表，ASCII码范围\x00-\x1f和\x7f-\xff，配合str.translate使用
+_DEL_TABLE = dict.fromkeys(list(range(0x00, 0x20)) + list(range(0x7f, 0x100)))
+# 不在中文、英文、数字、空格和常见标点符号范围内的字符
+_NON_CJK_RE = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9\s，。！？：；“”‘’（）《》【】、·…—]+')
+
+# SQLite性能相关的PRAGMA设置
+# synchronous=NORMAL：WAL模式下提交时不再每次fsync，仍能保证数据库不损坏
+# temp_store/mmap_size/cache_size：临时表放内存，使用内存映射读取并增大页缓存
+# busy_timeout：数据库被其他连接锁定时最多等待5秒，而不是立即报错
+SQLITE_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+"""
+
 class NewsToSQLite:
     """
     新闻联播爬虫结果存入SQLite数据库的类
     用于爬取指定日期的新闻联播内容，并将结果存入SQLite数据库
     """
     
-    def __init__(self, db_path='news.db'):
+    # 插入新闻的SQL语句，使用INSERT OR REPLACE
+    # 当遇到唯一约束冲突时，替换原有数据
+    # 每次使用同一个字符串，命中连接的预编译语句缓存，不再重复解析SQL
+    INSERT_NEWS_SQL = """
+    INSERT OR REPLACE INTO news_联播 (date, title, link, item_number, item_index, total_items, content, content_zstd)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+    """
+    
+    def __init__(self, db_path='news.db', concurrent_dates=1):
         """
         初始化NewsToSQLite实例
         
         :param db_path: SQLite数据库文件路径，默认为当前目录下的news.db
+        :param concurrent_dates: 共用本实例同时处理的日期数，用于确定HTTP连接池大小，默认为1
         """
         self.db_path = db_path  # 数据库文件路径
         self.conn = None  # 数据库连接对象，初始为None
         self.cursor = None  # 数据库游标对象，初始为None
+        # 数据库操作锁，批量运行时多个线程共用同一连接，查询和事务需要串行执行
+        self.db_lock = threading.Lock()
+        
+        # HTTP会话，复用与backend服务之间的连接
+        # 连接池大小为同时处理的日期数×每个日期获取新闻内容的线程数，并发请求不会因连接池已满而等待或丢弃连接
+        self.session = requests.Session()
+        pool_maxsize = max(1, concurrent_dates) * config['spider'].get('max_workers', 8)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 请求限速，所有线程共用，相邻两次请求backend的发起时间至少间隔request_delay秒
+        # 并发获取新闻内容和并发处理多个日期时，总请求速率仍不超过配置的上限
+        self.request_delay = config['spider'].get('request_delay', 0)
+        self.request_lock = threading.Lock()
+        self.next_request_time = 0.0  # 下一次允许发起请求的时间，time.monotonic()时间
+    
+    def wait_request_slot(self):
+        """
+        等待到允许发起下一次请求的时间
+        每次调用预约一个时间片，多个线程同时调用时依次间隔request_delay秒
+        """
+        with self.request_lock:
+            now = time.monotonic()
+            wait = self.next_request_time - now
+            self.next_request_time = max(now, self.next_request_time) + self.request_delay
+        if wait > 0:
+            time.sleep(wait)
     
     def connect(self):
         """
@@ -82,7 +165,19 @@ class NewsToSQLite:
         try:
             # 连接SQLite数据库
             # check_same_thread=False 允许在不同线程中使用同一个连接
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # isolation_level=None 关闭隐式事务，写入时显式使用BEGIN IMMEDIATE/COMMIT
+            # cached_statements=256 增大预编译语句缓存，重复执行的查询和插入语句无需再次解析
+            self.conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256
+            )
+            # WAL模式允许backend读取的同时写入，内存数据库不支持WAL，跳过
+            if self.db_path != ':memory:':
+                self.conn.execute("PRAGMA journal_mode=WAL;")
+            # 设置其余性能相关的PRAGMA
+            self.conn.executescript(SQLITE_PRAGMAS)
             # 设置row_factory为sqlite3.Row，使查询结果可以像字典一样访问
             self.conn.row_factory = sqlite3.Row
             # 获取游标对象，用于执行SQL语句
@@ -99,42 +194,16 @@ class NewsToSQLite:
     def create_table(self):
         """
         创建新闻表（如果不存在）
-        同时创建必要的索引，提高查询效率
+        同时创建必要的索引，提高查询效率；旧版本的表会迁移到最新结构
         
         :return: bool 是否创建成功，True表示成功，False表示失败
         """
-        # 创建新闻表的SQL语句
-        # IF NOT EXISTS 表示如果表已存在则不创建
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS news_联播 (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- 主键，自动递增
-            date TEXT NOT NULL,  -- 新闻日期，格式为YYYY-MM-DD
-            title TEXT NOT NULL,  -- 新闻标题
-            link TEXT NOT NULL UNIQUE,  -- 新闻链接，唯一约束，避免重复
-            item_number TEXT NOT NULL,  -- 新闻条目编号，格式：1/16
-            total_items INTEGER NOT NULL,  -- 当日新闻总条数
-            content TEXT NOT NULL,  -- 新闻内容
-            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- 创建时间，自动生成
-            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP  -- 更新时间，自动生成
-        );
-        """
         try:
-            # 执行创建表的SQL语句
-            self.cursor.execute(create_table_sql)
-            
-            # 创建索引，提高查询效率
-            # 按日期查询的索引
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_date ON news_联播(date);")
-            # 按标题查询的索引
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_title ON news_联播(title);")
-            # 按链接查询的索引
-            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_link ON news_联播(link);")
-            
-            # 提交事务
-            self.conn.commit()
-            
-            # 记录创建成功日志
-            logger.info("成功创建/确认新闻表和索引")
+            # 表结构和迁移与backend服务共用，已是最新版本时直接跳过
+            if ensure_schema(self.conn):
+                logger.info("成功创建/确认新闻表和索引")
+            else:
+                logger.debug("新闻表和索引已存在，跳过创建")
             return True
         except sqlite3.Error as e:
             # 创建失败，记录错误日志
@@ -149,12 +218,11 @@ class NewsToSQLite:
         :return: bool 是否已有数据，True表示已有数据，False表示没有数据或查询失败
         """
         try:
-            # 查询指定日期的数据数量
-            self.cursor.execute("SELECT COUNT(*) AS count FROM news_联播 WHERE date = ?", (date,))
-            # 获取查询结果
-            result = self.cursor.fetchone()
-            # 如果数量大于0，说明已有数据
-            return result['count'] > 0
+            with self.db_lock:
+                # 查询指定日期是否存在数据，命中第一条即停止
+                self.cursor.execute("SELECT 1 FROM news_联播 WHERE date = ? LIMIT 1", (date,))
+                # 有返回行说明已有数据
+                return self.cursor.fetchone() is not None
         except sqlite3.Error as e:
             # 查询失败，记录错误日志
             logger.error(f"检查日期数据失败: {e}")
@@ -171,13 +239,14 @@ class NewsToSQLite:
         try:
             # 构建请求URL，调用backend服务
             url = f'{config["spider"]["backend_url"]}/news/content?date={date}'
-            # 发送GET请求，使用配置文件中的超时时间
-            response = requests.get(url, timeout=config["spider"]["request_timeout"])
+            # 等待限速时间片后发送GET请求，使用配置文件中的超时时间
+            self.wait_request_slot()
+            response = self.session.get(url, timeout=config["spider"]["request_timeout"])
             
             # 检查响应状态码，200表示请求成功
             if response.status_code == 200:
-                # 解析JSON响应数据
-                data = response.json()
+                # 解析JSON响应数据，orjson直接解析原始字节，比response.json()更快
+                data = orjson.loads(response.content)
                 # 检查返回的code，200表示成功
                 if data['code'] == 200:
                     # 记录成功日志
@@ -208,13 +277,14 @@ class NewsToSQLite:
         try:
             # 构建请求URL，调用backend服务
             url = f'{config["spider"]["backend_url"]}/news/item?link={link}'
-            # 发送GET请求，使用配置文件中的超时时间
-            response = requests.get(url, timeout=config["spider"]["request_timeout"])
+            # 等待限速时间片后发送GET请求，使用配置文件中的超时时间
+            self.wait_request_slot()
+            response = self.session.get(url, timeout=config["spider"]["request_timeout"])
             
             # 检查响应状态码，200表示请求成功
             if response.status_code == 200:
-                # 解析JSON响应数据
-                data = response.json()
+                # 解析JSON响应数据，orjson直接解析原始字节，比response.json()更快
+                data = orjson.loads(response.content)
                 # 检查返回的code，200表示成功
                 if data['code'] == 200:
                     # 返回新闻内容
@@ -247,7 +317,7 @@ class NewsToSQLite:
         cleaned = content
         
         # 1. 移除所有HTML标签，使用正则表达式
-        cleaned = re.sub(r'<[^>]+>', '', cleaned)
+        cleaned = _TAG_RE.sub('', cleaned)
         
         # 2. 移除JavaScript代码模式1
         if 'ent").css("display","none");' in cleaned:
@@ -257,74 +327,71 @@ class NewsToSQLite:
         if 'if ($.trim($("#content_area").html())==""){' in cleaned:
             cleaned = cleaned.split('if ($.trim($("#content_area").html())==""{')[0]
         
-        # 4. 移除特殊字符和乱码，ASCII码范围
-        cleaned = re.sub(r'[\x00-\x1f\x7f-\xff]+', '', cleaned)
-        
-        # 5. 移除无效乱码，只保留中文、英文、数字、空格和常见标点符号
-        # [^\u4e00-\u9fa5a-zA-Z0-9\s，。！？：；“”‘’（）《》【】、·…—]+ 表示匹配不在这些范围内的字符
-        cleaned = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9\s，。！？：；“”‘’（）《》【】、·…—]+', '', cleaned, flags=re.UNICODE)
+        # 4. 移除特殊字符和乱码，ASCII码范围，使用预先构建的删除表一次完成
+        cleaned = cleaned.translate(_DEL_TABLE)
         
-        # 6. 移除连续空格和换行符，清理首尾空格
-        cleaned = cleaned.rstrip('\r\n')
-        cleaned = cleaned.strip()
+        # 5. 移除无效乱码，只保留中文、英文、数字、空格和常见标点符号，并清理首尾空格
+        cleaned = _NON_CJK_RE.sub('', cleaned).strip()
         
         # 返回清理后的内容
         return cleaned
     
-    def insert_news(self, news_item, date, total_items, item_index):
+    def insert_news_batch(self, items, date, total_items):
         """
-        插入新闻数据到数据库
+        批量插入新闻数据到数据库
+        所有条目使用同一条预编译语句executemany插入，并且只提交一次事务
         
-        :param news_item: 新闻条目字典，包含title、link、content等字段
+        :param items: 新闻条目列表，每个元素为(item_index, news_item)
+                      item_index为新闻条目索引，从0开始；news_item为包含title、link、content等字段的字典
         :param date: 新闻日期，格式为YYYY-MM-DD
         :param total_items: 当日新闻总条数
-        :param item_index: 当前新闻条目索引，从0开始
         :return: bool 是否插入成功，True表示成功，False表示失败
         """
-        try:
-            # 准备插入语句，使用INSERT OR REPLACE
-            # 当遇到唯一约束冲突时，替换原有数据
-            insert_sql = """
-            INSERT OR REPLACE INTO news_联播 (date, title, link, item_number, total_items, content)
-            VALUES (?, ?, ?, ?, ?, ?);
-            """
-            
-            # 准备插入数据
-            # item_number格式："1/16"，表示第1条，共16条
-            item_number = f"{item_index+1}/{total_items}"
-            # 清理新闻内容
-            content = self.clean_news_content(news_item.get('content', ''))
-            # 数据元组，对应SQL语句中的占位符
-            data = (
+        # 压缩器不能在多个线程间同时使用，每批新建一个
+        compressor = zstd.ZstdCompressor(level=6)
+        
+        # 准备插入数据，每个元组对应SQL语句中的占位符
+        # 清理和压缩内容在加锁之前完成，不占用数据库锁
+        rows = [
+            (
                 date,  # 新闻日期
                 news_item['title'],  # 新闻标题
                 news_item['link'],  # 新闻链接
-                item_number,  # 新闻条目编号
+                f"{item_index+1}/{total_items}",  # 新闻条目编号，格式："1/16"，表示第1条，共16条
+                item_index + 1,  # 新闻条目序号，从1开始
                 total_items,  # 当日新闻总条数
-                content  # 清理后的新闻内容
+                '',  # 新闻内容改为压缩存储，文本列留空
+                compressor.compress(self.clean_news_content(news_item.get('content', '')).encode('utf-8'))  # 清理并压缩后的新闻内容
             )
-            
-            # 执行插入语句
-            self.cursor.execute(insert_sql, data)
-            # 提交事务
-            self.conn.commit()
-            
-            # 记录插入成功日志
-            logger.info(f"成功插入新闻: {news_item['title']}")
-            return True
-        except sqlite3.Error as e:
-            # 插入失败，记录错误日志
-            logger.error(f"插入新闻失败: {e}")
-            return False
+            for item_index, news_item in items
+        ]
+        
+        # 插入、提交和回滚在同一把锁内完成，避免与其他线程的事务交错
+        with self.db_lock:
+            try:
+                # 开启写事务，立即获取写锁，避免事务中途因锁升级失败
+                self.cursor.execute("BEGIN IMMEDIATE")
+                # 批量执行插入语句
+                self.cursor.executemany(self.INSERT_NEWS_SQL, rows)
+                # 提交事务，整批只提交一次
+                self.cursor.execute("COMMIT")
+            except sqlite3.Error as e:
+                # 插入失败，回滚事务并记录错误日志
+                if self.conn.in_transaction:
+                    self.cursor.execute("ROLLBACK")
+                logger.error(f"批量插入新闻失败: {e}")
+                return False
+        
+        # 记录插入成功日志
+        logger.info(f"成功插入 {len(rows)} 条新闻")
+        return True
     
     def run(self, date):
         """
         主运行函数，执行完整的爬虫流程
         1. 连接数据库
         2. 创建表
-        3. 检查是否已有该日数据
-        4. 获取新闻列表
-        5. 遍历新闻列表，获取每条新闻的详细内容并插入数据库
+        3. 处理指定日期的新闻，见run_one
         
         :param date: 要爬取的日期，格式为YYYY-MM-DD
         :return: bool 是否执行成功，True表示成功，False表示失败
@@ -337,6 +404,21 @@ class NewsToSQLite:
         if not self.create_table():
             return False
         
+        # 处理指定日期的新闻
+        return self.run_one(date)
+    
+    def run_one(self, date):
+        """
+        处理单个日期的新闻，要求已经调用过connect和create_table
+        批量运行时多个日期复用同一个实例，只连接数据库和建表一次
+        1. 检查是否已有该日数据
+        2. 获取新闻列表
+        3. 遍历新闻列表，获取每条新闻的详细内容
+        4. 将获取成功的新闻一次性批量插入数据库
+        
+        :param date: 要爬取的日期，格式为YYYY-MM-DD
+        :return: bool 是否执行成功，True表示成功，False表示失败
+        """
         # 检查是否已有该日数据
         if self.has_date_data(date):
             logger.info(f"数据库中已有 {date} 的数据，跳过处理")
@@ -352,24 +434,34 @@ class NewsToSQLite:
         total_items = len(news_list)
         logger.info(f"开始处理 {date} 的 {total_items} 条新闻")
         
-        # 遍历新闻列表，获取每条新闻的详细内容并插入数据库
-        for i, news_item in enumerate(news_list):
-            logger.info(f"处理新闻 {i+1}/{total_items}: {news_item['title']}")
+        # 使用线程池并发获取每条新闻的详细内容，并发数由配置文件中的max_workers控制
+        fetched_items = []  # 获取内容成功的新闻条目，元素为(索引, 新闻条目)
+        max_workers = config['spider'].get('max_workers', 8)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for i, news_item in enumerate(news_list):
+                logger.info(f"处理新闻 {i+1}/{total_items}: {news_item['title']}")
+                futures[executor.submit(self.fetch_news_content, news_item['link'])] = i
             
-            # 获取新闻详情
-            content = self.fetch_news_content(news_item['link'])
-            if content:
-                # 将内容添加到新闻条目字典中
-                news_item['content'] = content
-                
-                # 插入数据库
-                self.insert_news(news_item, date, total_items, i)
-            else:
-                # 无法获取新闻内容，记录警告日志
-                logger.warning(f"无法获取新闻内容: {news_item['title']}")
-            
-            # 避免请求过快，添加配置文件中的延迟
-            time.sleep(config['spider']['request_delay'])
+            for future in as_completed(futures):
+                i = futures[future]
+                news_item = news_list[i]
+                # 获取新闻详情
+                content = future.result()
+                if content:
+                    # 将内容添加到新闻条目字典中
+                    news_item['content'] = content
+                    fetched_items.append((i, news_item))
+                else:
+                    # 无法获取新闻内容，记录警告日志
+                    logger.warning(f"无法获取新闻内容: {news_item['title']}")
+        
+        # 按原始顺序排列
+        fetched_items.sort(key=lambda item: item[0])
+        
+        # 批量插入数据库
+        if fetched_items and not self.insert_news_batch(fetched_items, date, total_items):
+            return False
         
         # 记录处理完成日志
         logger.info(f"完成处理 {date} 的所有新闻")
@@ -377,9 +469,11 @@ class NewsToSQLite:
     
     def close(self):
         """
-        关闭数据库连接
+        关闭数据库连接和HTTP会话
         释放资源，避免内存泄漏
         """
+        # 关闭HTTP会话，释放连接池中的连接；定时爬虫每次运行都会新建实例
+        self.session.close()
         try:
             # 如果游标对象存在，关闭游标
             if self.cursor:
@@ -396,33 +490,41 @@ class NewsToSQLite:
             logger.warning(f"关闭数据库连接时发生错误: {e}")
 
 
-def main():
+def main(date=None, db_path=None):
     """
     主函数，程序入口
-    解析命令行参数，创建NewsToSQLite实例并执行
-    """
-    # 创建命令行参数解析器
-    parser = argparse.ArgumentParser(description='新闻联播爬虫结果存入SQLite数据库')
-    
-    # 添加命令行参数
-    # --date: 要爬取的日期，必填参数
-    parser.add_argument('--date', required=True, help='要爬取的日期，格式：YYYY-MM-DD')
-    # --db: SQLite数据库文件路径，默认值为news.db
-    parser.add_argument('--db', default='news.db', help='SQLite数据库文件路径')
+    创建NewsToSQLite实例并执行；未传入日期时从命令行参数读取
+    其他脚本可以直接导入并调用main(date, db_path)，无需启动子进程
     
-    # 解析命令行参数
-    args = parser.parse_args()
+    :param date: 要爬取的日期，格式为YYYY-MM-DD，为None时解析命令行参数
+    :param db_path: SQLite数据库文件路径，为None时使用默认值news.db
+    :return: bool 是否执行成功，True表示成功，False表示失败
+    """
+    if date is None:
+        # 创建命令行参数解析器
+        parser = argparse.ArgumentParser(description='新闻联播爬虫结果存入SQLite数据库')
+        
+        # 添加命令行参数
+        # --date: 要爬取的日期，必填参数
+        parser.add_argument('--date', required=True, help='要爬取的日期，格式：YYYY-MM-DD')
+        # --db: SQLite数据库文件路径，默认值为news.db
+        parser.add_argument('--db', default='news.db', help='SQLite数据库文件路径')
+        
+        # 解析命令行参数
+        args = parser.parse_args()
+        date, db_path = args.date, args.db
     
     # 创建NewsToSQLite实例
-    news_to_sqlite = NewsToSQLite(db_path=args.db)
+    news_to_sqlite = NewsToSQLite(db_path=db_path or 'news.db')
     
     try:
         # 执行爬虫流程
-        success = news_to_sqlite.run(args.date)
+        success = news_to_sqlite.run(date)
         if success:
             logger.info("程序执行成功")
         else:
             logger.error("程序执行失败")
+        return success
     finally:
         # 无论执行成功与否，都要关闭数据库连接
         news_to_sqlite.close()
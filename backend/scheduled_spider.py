@@ -9,10 +9,10 @@
 import os  # 用于文件和目录操作
 import sys  # 用于系统相关操作，如退出程序
 import time  # 用于时间相关操作，如休眠
-import schedule  # 用于设置定时任务
+import sched  # 用于设置定时任务
 import logging  # 用于日志记录
-import subprocess  # 用于执行外部命令
-from datetime import datetime, timedelta  # 用于日期和时间处理
+from concurrent.futures import ThreadPoolExecutor, TimeoutError  # 用于带超时地执行爬虫任务
+from datetime import date, datetime, timedelta  # 用于日期和时间处理
 
 # 配置日志系统
 logging.basicConfig(
@@ -44,33 +44,44 @@ class ScheduledSpider:
         # SQLite数据库文件的完整路径
         self.db_path = os.path.join(self.script_dir, 'news.db')
         
-        # Python解释器的完整路径，用于执行爬虫脚本
-        self.python_path = config['batch']['python_path'] 
+        # 爬虫任务在单独的线程中执行，便于等待时设置超时
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        
+        # 定时任务调度器，使用单调时钟，系统时间被调整时不影响执行间隔
+        self.scheduler = sched.scheduler(time.monotonic, time.sleep)
+        # 任务执行间隔，单位为秒，每隔2小时执行一次
+        self.interval = 2 * 60 * 60
+        
+        # 今天日期字符串的缓存，格式为(date对象, 日期字符串)，日期变化后重新生成
+        self._today_cache = None
         
         # 记录初始化日志
         logger.info("=== 定时爬虫程序初始化 ===")
-        logger.info(f"脚本目录: {self.script_dir}")
-        logger.info(f"爬虫脚本: {self.spider_script}")
-        logger.info(f"数据库文件: {self.db_path}")
-        logger.info(f"Python解释器: {self.python_path}")
+        logger.info("脚本目录: %s", self.script_dir)
+        logger.info("爬虫脚本: %s", self.spider_script)
+        logger.info("数据库文件: %s", self.db_path)
         
-        # 检查必要文件是否存在
+        # 检查必要文件是否存在，并导入爬虫模块
         self.check_files()
     
     def check_files(self):
         """
-        检查必要文件是否存在
-        包括Python解释器和爬虫脚本
-        如果文件不存在，记录错误并退出程序
+        检查必要文件是否存在，并导入爬虫模块
+        爬虫在本进程内直接调用，不再每次启动新的Python解释器
+        如果文件不存在或导入失败，记录错误并退出程序
         """
-        # 检查Python解释器是否存在
-        if not os.path.exists(self.python_path):
-            logger.error(f"Python解释器不存在: {self.python_path}")
-            sys.exit(1)  # 退出程序，返回码1表示错误
-        
         # 检查爬虫脚本是否存在
         if not os.path.exists(self.spider_script):
-            logger.error(f"爬虫脚本不存在: {self.spider_script}")
+            logger.error("爬虫脚本不存在: %s", self.spider_script)
+            sys.exit(1)  # 退出程序，返回码1表示错误
+        
+        # 导入爬虫模块，只导入一次，之后每次执行任务直接调用其main函数
+        try:
+            sys.path.insert(0, self.script_dir)
+            import news_to_sqlite
+            self.crawl = news_to_sqlite.main
+        except Exception as e:
+            logger.error("导入爬虫模块失败: %s", e)
             sys.exit(1)  # 退出程序，返回码1表示错误
         
         # 所有必要文件检查通过
@@ -82,7 +93,11 @@ class ScheduledSpider:
         
         :return: 今天的日期字符串，格式为YYYY-MM-DD
         """
-        return datetime.now().strftime('%Y-%m-%d')
+        today = date.today()
+        # 同一天内直接返回缓存的字符串，跨天后才重新格式化
+        if self._today_cache is None or self._today_cache[0] != today:
+            self._today_cache = (today, f"{today.year:04d}-{today.month:02d}-{today.day:02d}")
+        return self._today_cache[1]
     
     def run_spider(self):
         """
@@ -91,61 +106,27 @@ class ScheduledSpider:
         """
         # 获取今天的日期
         today = self.get_today_date()
-        logger.info(f"=== 开始执行爬虫任务 ===")
-        logger.info(f"爬取日期: {today}")
+        logger.info("=== 开始执行爬虫任务 ===")
+        logger.info("爬取日期: %s", today)
         
         try:
-            # 构建执行命令列表
-            # 命令格式：python.exe news_to_sqlite.py --date YYYY-MM-DD --db news.db
-            cmd = [
-                self.python_path,  # Python解释器
-                self.spider_script,  # 爬虫脚本
-                '--date', today,  # 日期参数，爬取今天的新闻
-                '--db', self.db_path  # 数据库路径参数
-            ]
-            
-            # 记录执行命令日志
-            logger.info(f"执行命令: {' '.join(cmd)}")
-            
-            # 执行命令，捕获输出和错误
-            # subprocess.run()用于执行外部命令
-            # capture_output=True 捕获标准输出和标准错误
-            # text=True 将输出转换为字符串格式
-            # cwd=self.script_dir 设置命令执行的工作目录
-            # timeout=300 设置超时时间为5分钟
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=self.script_dir,
-                timeout=300  # 设置5分钟超时
-            )
+            # 在本进程内直接调用爬虫，爬虫的日志直接写入本程序的日志
+            # 在线程中执行，最多等待5分钟
+            future = self.executor.submit(self.crawl, today, self.db_path)
+            success = future.result(timeout=300)
             
-            # 检查命令执行结果
-            if result.returncode == 0:  # returncode为0表示命令执行成功
-                logger.info(f"✅ 爬虫任务执行成功")
-                
-                # 如果有标准输出，记录为debug级别日志
-                if result.stdout:
-                    logger.debug(f"输出: {result.stdout}")
-                
-                # 如果有标准错误，记录为warning级别日志
-                if result.stderr:
-                    logger.warning(f"警告: {result.stderr}")
-            else:  # returncode不为0表示命令执行失败
-                logger.error(f"❌ 爬虫任务执行失败，返回码: {result.returncode}")
-                
-                # 记录错误信息
-                if result.stdout:
-                    logger.error(f"输出: {result.stdout}")
-                if result.stderr:
-                    logger.error(f"错误: {result.stderr}")
-        except subprocess.TimeoutExpired:  # 捕获超时异常
-            logger.error(f"❌ 爬虫任务执行超时")
+            # 检查执行结果
+            if success:
+                logger.info("✅ 爬虫任务执行成功")
+            else:
+                logger.error("❌ 爬虫任务执行失败")
+        except TimeoutError:  # 捕获超时异常
+            # 线程无法被强制终止，超时的任务会在后台继续执行完，下一次任务排在其后
+            logger.error("❌ 爬虫任务执行超时")
         except Exception as e:  # 捕获其他异常
-            logger.error(f"❌ 执行爬虫任务时发生异常: {e}")
+            logger.error("❌ 执行爬虫任务时发生异常: %s", e)
         finally:  # 无论是否发生异常，都会执行
-            logger.info(f"=== 爬虫任务执行结束 ===")
+            logger.info("=== 爬虫任务执行结束 ===")
     
     def run_immediately(self):
         """
@@ -155,39 +136,49 @@ class ScheduledSpider:
         logger.info("立即执行一次爬虫任务...")
         self.run_spider()
     
-    def setup_schedule(self):
+    def schedule_next(self, run_at):
         """
-        设置定时任务
-        使用schedule库设置每隔2小时执行一次爬虫任务
+        安排下一次爬虫任务
+        
+        :param run_at: 下一次执行的时间点，time.monotonic()时钟下的秒数
         """
-        # 每隔2小时执行一次run_spider方法
-        schedule.every(2).hours.do(self.run_spider)
-        logger.info("✅ 定时任务设置完成，每隔2小时执行一次")
-        logger.info(f"下次执行时间: {schedule.next_run()}")  # 打印下次执行时间
+        self.scheduler.enterabs(run_at, 1, self.tick, (run_at,))
+        # 打印下次执行时间
+        next_run = datetime.now() + timedelta(seconds=run_at - time.monotonic())
+        logger.info("下次执行时间: %s", next_run.strftime('%Y-%m-%d %H:%M:%S'))
+    
+    def tick(self, run_at):
+        """
+        定时任务，执行一次爬虫任务后安排下一次
+        下一次的时间点从本次计划时间起算，执行耗时不会累积造成时间漂移
+        
+        :param run_at: 本次计划执行的时间点
+        """
+        self.run_spider()
+        self.schedule_next(run_at + self.interval)
     
     def start(self):
         """
         启动定时爬虫程序
         1. 立即执行一次爬虫任务
         2. 设置定时任务
-        3. 启动调度器，循环检查并执行任务
+        3. 启动调度器，休眠到下一次任务的时间点再执行
         """
         # 立即执行一次爬虫任务
         self.run_immediately()
         
         # 设置定时任务
-        self.setup_schedule()
+        self.schedule_next(time.monotonic() + self.interval)
+        logger.info("✅ 定时任务设置完成，每隔2小时执行一次")
         
-        # 启动调度器，循环检查并执行任务
+        # 启动调度器，两次任务之间一直休眠，不再每分钟唤醒检查
         logger.info("启动调度器，按Ctrl+C停止")
         try:
-            while True:  # 无限循环
-                schedule.run_pending()  # 运行所有待执行的任务
-                time.sleep(60)  # 每60秒检查一次是否有任务需要执行
+            self.scheduler.run()
         except KeyboardInterrupt:  # 捕获Ctrl+C中断信号
             logger.info("收到终止信号，退出程序")
         except Exception as e:  # 捕获其他异常
-            logger.error(f"调度器运行时发生异常: {e}")
+            logger.error("调度器运行时发生异常: %s", e)
 
 
 # 程序入口检查
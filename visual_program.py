@@ -17,22 +17,45 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext
 from tkinter.messagebox import showinfo, showerror, askyesno
 import threading
-import psutil
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import logging.handlers
+import queue
 
-# 配置日志
+# 配置日志，记录日志时只放入队列，由后台线程写出
+_log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('visual_program.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)  # 是否输出由界面选择的日志级别决定，这里不再过滤
+
+# 日志文本框最多保留的行数，超过后删除最早的日志行
+_LOG_MAX_LINES = 5000
+_LOG_TRIM_LINES = 2000
+
+# 日志级别对应的数值，低于所选级别的日志不输出
+_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# 检查子进程退出队列的间隔（毫秒），只在有子进程运行时检查，退出后最迟1秒更新界面
+_EXIT_POLL_MS = 1000
+
+# 服务状态对应的显示颜色，其他状态（如启动失败）显示为红色
+_STATUS_COLORS = {"运行中": "#009900", "已停止": "#666666"}
 
 class NewsSpiderVisualApp:
     def __init__(self):
+        # 启动后台日志线程，文件日志先缓存在内存中，每64条或遇到ERROR时一次性写入
+        file_handler = logging.handlers.MemoryHandler(
+            capacity=64,
+            flushLevel=logging.ERROR,
+            target=logging.FileHandler('visual_program.log', encoding='utf-8')
+        )
+        self.log_listener = logging.handlers.QueueListener(_log_queue, file_handler, logging.StreamHandler())
+        self.log_listener.start()
+        
         # 初始化主窗口
         self.root = tk.Tk()
         self.root.title("新闻联播爬虫管理系统")
@@ -45,15 +68,9 @@ class NewsSpiderVisualApp:
         
         # 配置ttk样式，使其与淡蓝色背景匹配
         self.style = ttk.Style()
-        self.style.configure("TFrame", background="#E6F3FF")
-        self.style.configure("TLabelFrame", background="#E6F3FF")
-        self.style.configure("TLabel", background="#E6F3FF")
-        self.style.configure("TButton", background="#E6F3FF")
-        self.style.configure("TCombobox", background="#E6F3FF")
-        self.style.configure("TNotebook", background="#E6F3FF")
-        self.style.configure("TNotebook.Tab", background="#E6F3FF")
-        self.style.configure("Vertical.TScrollbar", background="#E6F3FF")
-        self.style.configure("Horizontal.TScrollbar", background="#E6F3FF")
+        for style_name in ("TFrame", "TLabelFrame", "TLabel", "TButton", "TCombobox", "TNotebook",
+                           "TNotebook.Tab", "Vertical.TScrollbar", "Horizontal.TScrollbar"):
+            self.style.configure(style_name, background="#E6F3FF")
         
         # 设置跨平台字体
         self.default_font = ('Arial', 10)
@@ -64,6 +81,24 @@ class NewsSpiderVisualApp:
         self.spider_process = None
         self.is_running = True
         
+        # 上次读取到的数据库文件修改时间，文件未变化时跳过界面更新；None表示上次检查时文件不存在
+        self._last_db_mtime = -1
+        
+        # 读取数据库文件信息的后台线程，数据库位于慢速磁盘时不阻塞界面
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        
+        # 待写入日志文本框的日志，空闲时一次性写入
+        self._log_buf = []
+        self._log_flush_pending = False
+        
+        # 子进程退出记录，由等待线程放入，主线程定时取出后更新界面；等待中的子进程数为0时停止检查
+        # 等待线程不调用任何Tk方法，非线程化的Tcl也能正常工作
+        self._exit_queue = queue.SimpleQueue()
+        self._watch_count = 0
+        
+        # 当前选择的日志级别数值，默认为INFO
+        self._level_threshold = _LEVELS["INFO"]
+        
         # 获取当前可执行文件或脚本所在目录
         if getattr(sys, 'frozen', False):
             # 打包后的环境
@@ -87,6 +122,9 @@ class NewsSpiderVisualApp:
         self.backend_script = os.path.join(current_dir, "backend", "backend.py")
         self.spider_script = os.path.join(current_dir, "backend", "scheduled_spider.py")
         
+        # 这些路径在运行期间不会变化，启动时检查一次是否存在并缓存结果
+        self._paths_ok = {p: os.path.exists(p) for p in (self.python_path, self.backend_script, self.spider_script)}
+        
         # 初始化界面
         self.create_widgets()
         
@@ -252,6 +290,11 @@ class NewsSpiderVisualApp:
         self.log_level_var = tk.StringVar(value="INFO")
         log_level_combo = ttk.Combobox(log_control_frame, textvariable=self.log_level_var, values=["DEBUG", "INFO", "WARNING", "ERROR"], width=10)
         log_level_combo.pack(side=tk.LEFT, padx=5)
+        log_level_combo.bind("<<ComboboxSelected>>", self.on_log_level_changed)
+    
+    def on_log_level_changed(self, event=None):
+        """切换日志级别"""
+        self._level_threshold = _LEVELS.get(self.log_level_var.get(), _LEVELS["INFO"])
     
     def check_files(self):
         """检查必要文件是否存在"""
@@ -262,7 +305,7 @@ class NewsSpiderVisualApp:
         ]
         
         for file_path, file_name in files_to_check:
-            if os.path.exists(file_path):
+            if self._paths_ok[file_path]:
                 self.log(f"✅ {file_name} 存在", "INFO")
             else:
                 self.log(f"❌ {file_name} 不存在: {file_path}", "ERROR")
@@ -285,7 +328,7 @@ class NewsSpiderVisualApp:
             self.log("正在启动Backend服务...", "INFO")
             
             # 确保backend脚本存在
-            if not os.path.exists(self.backend_script):
+            if not self._paths_ok[self.backend_script]:
                 self.log(f"Backend脚本不存在: {self.backend_script}", "ERROR")
                 self.update_backend_status("启动失败")
                 return
@@ -293,14 +336,21 @@ class NewsSpiderVisualApp:
             # 获取backend脚本所在目录
             backend_dir = os.path.dirname(self.backend_script)
             
-            self.backend_process = subprocess.Popen(
-                [self.python_path, self.backend_script],
-                cwd=backend_dir if os.path.exists(backend_dir) else None,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=subprocess.CREATE_NEW_CONSOLE if sys.platform == "win32" else 0
-            )
+            # Backend服务只用print输出日志，把输出追加写入backend.log；使用管道却不读取，输出过多时子进程会阻塞
+            # 关闭输出缓冲使日志及时写入文件，并统一以UTF-8编码写入
+            with open(os.path.join(backend_dir, "backend.log"), "a", encoding="utf-8") as backend_log:
+                self.backend_process = subprocess.Popen(
+                    [self.python_path, self.backend_script],
+                    cwd=backend_dir,
+                    env=dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8"),
+                    stdin=subprocess.DEVNULL,
+                    stdout=backend_log,
+                    stderr=subprocess.STDOUT,
+                    creationflags=subprocess.CREATE_NEW_CONSOLE if sys.platform == "win32" else 0
+                )
+            
+            # 进程退出时自动通知界面，无需定时检查进程状态
+            self.watch_process(self.backend_process, self.on_backend_exit)
             
             self.log(f"Backend服务启动成功，PID: {self.backend_process.pid}", "INFO")
             self.update_backend_status("运行中")
@@ -322,6 +372,7 @@ class NewsSpiderVisualApp:
             self.log(f"正在停止Backend服务，PID: {self.backend_process.pid}...", "INFO")
             self.backend_process.terminate()
             self.backend_process.wait(timeout=5)
+            self.backend_process = None  # 主动停止，不再处理该进程的退出通知
             self.log("Backend服务已停止", "INFO")
             self.update_backend_status("已停止")
             self.update_backend_pid("未运行")
@@ -331,8 +382,9 @@ class NewsSpiderVisualApp:
     
     def restart_backend(self):
         """重启Backend服务"""
+        # stop_backend已等待进程退出，可以立即启动，无需再固定等待1秒
         self.stop_backend()
-        self.root.after(1000, self.start_backend)
+        self.start_backend()
     
     def start_spider(self):
         """启动定时爬虫"""
@@ -344,7 +396,7 @@ class NewsSpiderVisualApp:
             self.log("正在启动定时爬虫...", "INFO")
             
             # 确保spider脚本存在
-            if not os.path.exists(self.spider_script):
+            if not self._paths_ok[self.spider_script]:
                 self.log(f"定时爬虫脚本不存在: {self.spider_script}", "ERROR")
                 self.update_spider_status("启动失败")
                 return
@@ -354,13 +406,17 @@ class NewsSpiderVisualApp:
             
             self.spider_process = subprocess.Popen(
                 [self.python_path, self.spider_script],
-                cwd=spider_dir if os.path.exists(spider_dir) else None,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
+                cwd=spider_dir,
+                # 子进程自己写日志文件，丢弃其输出；使用管道却不读取，输出过多时子进程会阻塞
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 creationflags=subprocess.CREATE_NEW_CONSOLE if sys.platform == "win32" else 0
             )
             
+            # 进程退出时自动通知界面，无需定时检查进程状态
+            self.watch_process(self.spider_process, self.on_spider_exit)
+            
             self.log(f"定时爬虫启动成功，PID: {self.spider_process.pid}", "INFO")
             self.update_spider_status("运行中")
             self.update_spider_pid(str(self.spider_process.pid))
@@ -381,6 +437,7 @@ class NewsSpiderVisualApp:
             self.log(f"正在停止定时爬虫，PID: {self.spider_process.pid}...", "INFO")
             self.spider_process.terminate()
             self.spider_process.wait(timeout=5)
+            self.spider_process = None  # 主动停止，不再处理该进程的退出通知
             self.log("定时爬虫已停止", "INFO")
             self.update_spider_status("已停止")
             self.update_spider_pid("未运行")
@@ -390,32 +447,62 @@ class NewsSpiderVisualApp:
     
     def restart_spider(self):
         """重启定时爬虫"""
+        # stop_spider已等待进程退出，可以立即启动，无需再固定等待1秒
         self.stop_spider()
-        self.root.after(1000, self.start_spider)
+        self.start_spider()
+    
+    def watch_process(self, process, on_exit):
+        """启动后台线程等待子进程退出，退出后在主线程中调用on_exit(process, returncode)"""
+        threading.Thread(target=self._wait_process, args=(process, on_exit), daemon=True).start()
+        self._watch_count += 1
+        if self._watch_count == 1:  # 之前没有在等待的进程，开始检查退出队列
+            self.root.after(_EXIT_POLL_MS, self._poll_process_exits)
+    
+    def _wait_process(self, process, on_exit):
+        """阻塞等待子进程退出，在后台线程执行，只记录返回码，不调用Tk"""
+        self._exit_queue.put((process, on_exit, process.wait()))
+    
+    def _poll_process_exits(self):
+        """在主线程中处理已退出的子进程，仍有等待中的进程时继续定时检查"""
+        while not self._exit_queue.empty():
+            process, on_exit, returncode = self._exit_queue.get_nowait()
+            self._watch_count -= 1
+            on_exit(process, returncode)
+        if self._watch_count > 0:
+            self.root.after(_EXIT_POLL_MS, self._poll_process_exits)
+    
+    def on_backend_exit(self, process, returncode):
+        """Backend服务进程意外退出时更新界面"""
+        if process is not self.backend_process:  # 已主动停止或已重启，忽略
+            return
+        self.backend_process = None
+        self.log(f"Backend服务已退出，返回码: {returncode}", "WARNING")
+        self.update_backend_status("已退出")
+        self.update_backend_pid("未运行")
+        self.update_backend_buttons(False)
+    
+    def on_spider_exit(self, process, returncode):
+        """定时爬虫进程意外退出时更新界面"""
+        if process is not self.spider_process:  # 已主动停止或已重启，忽略
+            return
+        self.spider_process = None
+        self.log(f"定时爬虫已退出，返回码: {returncode}", "WARNING")
+        self.update_spider_status("已退出")
+        self.update_spider_pid("未运行")
+        self.update_spider_buttons(False)
+    
+    def _set_status(self, var, label, status):
+        """更新服务状态文字和颜色"""
+        var.set(status)
+        label.config(foreground=_STATUS_COLORS.get(status, "#CC0000"))
     
     def update_backend_status(self, status):
         """更新Backend服务状态"""
-        self.backend_status_var.set(status)
-        
-        # 更新状态颜色
-        if status == "运行中":
-            self.backend_status_label.config(foreground="#009900")
-        elif status == "已停止":
-            self.backend_status_label.config(foreground="#666666")
-        else:
-            self.backend_status_label.config(foreground="#CC0000")
+        self._set_status(self.backend_status_var, self.backend_status_label, status)
     
     def update_spider_status(self, status):
         """更新爬虫状态"""
-        self.spider_status_var.set(status)
-        
-        # 更新状态颜色
-        if status == "运行中":
-            self.spider_status_label.config(foreground="#009900")
-        elif status == "已停止":
-            self.spider_status_label.config(foreground="#666666")
-        else:
-            self.spider_status_label.config(foreground="#CC0000")
+        self._set_status(self.spider_status_var, self.spider_status_label, status)
     
     def update_backend_pid(self, pid):
         """更新Backend PID"""
@@ -453,10 +540,35 @@ class NewsSpiderVisualApp:
         self.root.after(10000, self.start_db_monitor)  # 每10秒更新一次
     
     def update_db_size(self):
-        """更新数据库大小"""
+        """更新数据库大小，文件信息在后台线程读取"""
+        future = self._io_pool.submit(self._stat_db)
+        self.root.after(50, self._apply_db_stat, future)
+    
+    def _stat_db(self):
+        """读取数据库文件信息，文件不存在时返回None，在后台线程执行"""
+        # 只调用一次os.stat，同时得到文件是否存在和文件大小
+        try:
+            return os.stat(self.db_path)
+        except FileNotFoundError:
+            return None
+    
+    def _apply_db_stat(self, future):
+        """根据读取到的文件信息更新数据库大小，在主线程执行"""
+        # 后台线程还未读取完成，稍后再检查，界面线程不等待
+        if not future.done():
+            self.root.after(50, self._apply_db_stat, future)
+            return
+        
         try:
-            if os.path.exists(self.db_path):
-                size_bytes = os.path.getsize(self.db_path)
+            st = future.result()
+            
+            if st is not None:
+                # 文件未修改，大小也不会变化，不再更新界面
+                if st.st_mtime_ns == self._last_db_mtime:
+                    return
+                self._last_db_mtime = st.st_mtime_ns
+                
+                size_bytes = st.st_size
                 size_kb = size_bytes / 1024
                 size_mb = size_kb / 1024
                 
@@ -468,34 +580,54 @@ class NewsSpiderVisualApp:
                 self.db_size_var.set(size_str)
                 self.log(f"数据库大小更新: {size_str}", "DEBUG")
             else:
+                # 文件仍不存在，界面已显示过，不再重复设置
+                if self._last_db_mtime is None:
+                    return
+                self._last_db_mtime = None
                 self.db_size_var.set("数据库不存在")
         except Exception as e:
             self.log(f"更新数据库大小失败: {str(e)}", "ERROR")
     
     def is_process_running(self, process):
         """检查进程是否在运行"""
-        try:
-            return psutil.pid_exists(process.pid) and psutil.Process(process.pid).status() != psutil.STATUS_ZOMBIE
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return False
+        # 进程由本程序启动，poll()返回None表示尚未退出
+        return process is not None and process.poll() is None
     
     def log(self, message, level="INFO"):
         """记录日志"""
+        # 低于所选级别的日志直接跳过，不格式化也不写入文本框和文件
+        if _LEVELS.get(level, _LEVELS["INFO"]) < self._level_threshold:
+            return
+        
+        # 输出到文件和控制台，按对应级别记录，时间由日志格式添加
+        getattr(logger, level.lower(), logger.info)(message)
+        
+        # 输出到日志文本框，先放入缓冲，界面空闲时合并写入；文本框不经过日志格式，需自行加上时间
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level}] {message}\n"
+        self._log_buf.append(f"[{timestamp}] [{level}] {message}\n")
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.root.after_idle(self._flush_log)
+    
+    def _flush_log(self):
+        """将缓冲的日志一次性写入日志文本框"""
+        self._log_flush_pending = False
+        if not self._log_buf:
+            return
         
-        # 输出到控制台
-        print(log_entry.strip())
+        self.log_text.insert(tk.END, ''.join(self._log_buf))
+        self._log_buf.clear()
         
-        # 输出到日志文本框
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
+        # 限制日志行数，避免文本框占用的内存无限增长
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > _LOG_MAX_LINES:
+            self.log_text.delete('1.0', f'{_LOG_TRIM_LINES + 1}.0')
         
-        # 输出到文件
-        logging.info(message)
+        self.log_text.see(tk.END)
     
     def clear_log(self):
         """清空日志"""
+        self._log_buf.clear()
         self.log_text.delete(1.0, tk.END)
         self.log("日志已清空", "INFO")
     
@@ -510,6 +642,12 @@ class NewsSpiderVisualApp:
             
             # 关闭窗口
             self.root.destroy()
+            self._io_pool.shutdown(wait=False)
+            
+            # 写完队列和内存缓冲中剩余的日志
+            self.log_listener.stop()
+            for handler in self.log_listener.handlers:
+                handler.close()
 
 if __name__ == "__main__":
     app = NewsSpiderVisualApp()
\ No newline at end of file